@@ -0,0 +1,95 @@
+import threading
+
+import numpy as np
+
+from intervals import IntervalSet
+
+
+class PackedAvailability:
+    """
+    Every teacher's availability packed into flat NumPy arrays.
+
+    Slot k belongs to teacher owners[k] (an index into teacher_ids) and spans
+    [starts[k], ends[k]) in epoch seconds. Each teacher's slots are merged first,
+    so they never overlap each other.
+    """
+
+    def __init__(self, teachers):
+        starts, ends, owners = [], [], []
+        self.teacher_ids = []
+        for teacher in teachers:
+            slots = IntervalSet.from_wire(teacher.get("available"))
+            slot_starts, slot_ends = slots.epochs()
+            starts.extend(slot_starts)
+            ends.extend(slot_ends)
+            owners.extend([len(self.teacher_ids)] * len(slots))
+            self.teacher_ids.append(str(teacher.get("id")))
+        self.starts = np.asarray(starts, dtype=np.float64)
+        self.ends = np.asarray(ends, dtype=np.float64)
+        self.owners = np.asarray(owners, dtype=np.int64)
+
+    def overlap_minutes(self, student_slots):
+        """
+        Minutes of overlap between each teacher's availability and the student's.
+
+        The student's slots are disjoint and sorted, so the time they cover up to any
+        instant x is a prefix sum plus one partial slot. The overlap of a teacher slot
+        [a, b) is then covered(b) - covered(a), computed for every slot at once with
+        searchsorted and summed per teacher with bincount.
+
+        Args:
+            student_slots (IntervalSet): The student's availability.
+
+        Returns:
+            numpy.ndarray: Overlap minutes, aligned with teacher_ids.
+        """
+        minutes = np.zeros(len(self.teacher_ids), dtype=np.float64)
+        student_starts, student_ends = (np.asarray(a, dtype=np.float64) for a in student_slots.epochs())
+        if not len(student_starts) or not len(self.starts):
+            return minutes
+
+        covered_full = np.concatenate(([0.0], np.cumsum(student_ends - student_starts)))
+
+        def covered_until(x):
+            i = np.searchsorted(student_starts, x, side="right")  # student slots starting at/before x
+            last = np.maximum(i - 1, 0)
+            partial = np.clip(np.minimum(x, student_ends[last]) - student_starts[last], 0.0, None)
+            return np.where(i > 0, covered_full[last] + partial, 0.0)
+
+        overlap = covered_until(self.ends) - covered_until(self.starts)
+        minutes += np.bincount(self.owners, weights=overlap, minlength=len(self.teacher_ids)) / 60.0
+        return minutes
+
+
+_packed = None
+_packed_version = None
+_packed_lock = threading.Lock()
+
+
+def packed_for_index(index):
+    """Return PackedAvailability for a TeacherIndex, repacking only when the index changed."""
+    global _packed, _packed_version
+    with _packed_lock:
+        if _packed is None or _packed_version != (id(index), index.version):
+            _packed = PackedAvailability(index.documents())
+            _packed_version = (id(index), index.version)
+        return _packed
+
+
+def rank_by_overlap(teachers, student_slots, packed):
+    """
+    Keep the teachers whose availability overlaps the student's, most overlap first.
+
+    Args:
+        teachers (list): Teacher documents to rank (e.g. a filtered index query).
+        student_slots (IntervalSet): The student's availability.
+        packed (PackedAvailability): Packed availability covering those teachers.
+
+    Returns:
+        list: (teacher, overlap_minutes) tuples sorted by overlap, descending.
+    """
+    minutes = dict(zip(packed.teacher_ids, packed.overlap_minutes(student_slots).tolist()))
+    ranked = [(teacher, minutes.get(str(teacher.get("id")), 0.0)) for teacher in teachers]
+    ranked = [item for item in ranked if item[1] > 0]
+    ranked.sort(key=lambda item: item[1], reverse=True)
+    return ranked
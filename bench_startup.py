@@ -0,0 +1,105 @@
+"""
+Import-time and first-render benchmark for the Streamlit app.
+
+Every sample runs in a fresh interpreter so nothing is warm:
+
+    python bench_startup.py --runs 7
+    python bench_startup.py --output bench_output.txt   # also append a JSON line, to track over time
+
+Reported (median / min over the runs, milliseconds):
+  streamlit      import streamlit (paid by `streamlit run` regardless of the app)
+  app modules    import website on top of that
+  render: auth   first script run of the login page (AppTest, includes importing the app)
+  render: teacher  first script run of a logged-in teacher's dashboard against mock_backend
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+_IMPORT_PROBE = """
+import json, time
+t0 = time.perf_counter()
+import streamlit, streamlit.runtime.scriptrunner
+t1 = time.perf_counter()
+import website
+t2 = time.perf_counter()
+print(json.dumps({"streamlit": 1000 * (t1 - t0), "app modules": 1000 * (t2 - t1)}))
+"""
+
+_RENDER_PROBE = """
+import json, logging, os, sys, time
+import mock_backend
+server, url = mock_backend.serve_in_thread(mock_backend.generate_dataset(200, seed=1))
+os.environ["BASE_URL"] = url
+logging.disable(logging.CRITICAL)
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(os.path.join(os.getcwd(), "website.py"), default_timeout=60)
+if sys.argv[1] == "teacher":
+    at.session_state.user_id = next(iter(server.store.teachers))
+    at.session_state.user_authenticated = True
+    at.session_state.profile_type = "Teacher"
+    at.session_state.navigation = "main_app"
+t0 = time.perf_counter()
+at.run()
+elapsed = time.perf_counter() - t0
+assert not at.exception, [e.value for e in at.exception]
+print(json.dumps({"render: " + sys.argv[1]: 1000 * elapsed}))
+server.shutdown()
+"""
+
+
+def _sample(code, *args):
+    env = {**os.environ, "BASE_URL": os.environ.get("BASE_URL", "http://127.0.0.1:9")}
+    out = subprocess.run([sys.executable, "-c", code, *args], cwd=HERE, env=env, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(runs):
+    """Collect `runs` samples of each measurement; returns {name: [milliseconds, ...]}."""
+    samples = {}
+    for _ in range(runs):
+        for probe, args in ((_IMPORT_PROBE, ()), (_RENDER_PROBE, ("auth",)), (_RENDER_PROBE, ("teacher",))):
+            for name, value in _sample(probe, *args).items():
+                samples.setdefault(name, []).append(value)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import and first-render time.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="append the results as one JSON line to this file")
+    args = parser.parse_args()
+
+    # Make sure bytecode is compiled so the first sample isn't penalised.
+    subprocess.run([sys.executable, "-m", "compileall", "-q", HERE], check=False)
+    samples = run(args.runs)
+
+    print(f"{'measurement':<18}{'median ms':>10}{'min ms':>10}")
+    summary = {}
+    for name, values in samples.items():
+        summary[name] = {"median_ms": round(statistics.median(values), 1), "min_ms": round(min(values), 1)}
+        print(f"{name:<18}{summary[name]['median_ms']:>10}{summary[name]['min_ms']:>10}")
+
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "revision": _git_revision(),
+                                "runs": args.runs, "results": summary}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
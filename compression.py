@@ -0,0 +1,77 @@
+import gzip
+import logging
+import threading
+
+from config import env
+
+logger = logging.getLogger(__name__)
+
+try:  # optional: brotli (or its cffi build) adds "br"
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:  # optional: zstandard adds "zstd"
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Content codings we can produce and read, most preferred first. urllib3 decodes a
+# response in any of these when the same optional package is installed.
+CODECS = {}
+if zstandard is not None:
+    CODECS["zstd"] = (lambda data: zstandard.ZstdCompressor(level=3).compress(data),
+                      lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data))
+if brotli is not None:
+    CODECS["br"] = (lambda data: brotli.compress(data, quality=5), brotli.decompress)
+CODECS["gzip"] = (lambda data: gzip.compress(data, compresslevel=6, mtime=0), gzip.decompress)
+
+_request_compression_unsupported = False
+_unsupported_lock = threading.Lock()
+
+
+def accept_encoding():
+    """
+    The Accept-Encoding header to send: every codec in CODECS, unless HTTP_ACCEPT_ENCODING
+    overrides it (e.g. "identity" to ask for uncompressed responses).
+    """
+    return env("HTTP_ACCEPT_ENCODING") or ", ".join(CODECS)
+
+
+def request_encoding(size):
+    """
+    The coding to compress a request body of `size` bytes with, or None to send it as is.
+
+    Request bodies are only compressed when REQUEST_COMPRESSION names a codec in CODECS
+    (off by default: not every API accepts them) and the body is at least
+    REQUEST_COMPRESSION_MIN_BYTES long, below which the savings don't pay for the CPU.
+    """
+    encoding = (env("REQUEST_COMPRESSION") or "").strip().lower()
+    if not encoding or encoding in ("0", "off", "none", "identity") or _request_compression_unsupported:
+        return None
+    if encoding not in CODECS:
+        logger.warning("REQUEST_COMPRESSION=%s isn't available; sending request bodies uncompressed.", encoding)
+        return None
+    return encoding if size >= int(env("REQUEST_COMPRESSION_MIN_BYTES", "1024")) else None
+
+
+def compress(data, encoding):
+    """Compress `data` (bytes) with one of CODECS."""
+    return CODECS[encoding][0](data)
+
+
+def decompress(data, encoding):
+    """Decompress `data` (bytes) coded with one of CODECS."""
+    return CODECS[encoding][1](data)
+
+
+def mark_request_compression_unsupported():
+    """Stop compressing request bodies: the backend refused one (415 Unsupported Media Type)."""
+    global _request_compression_unsupported
+    with _unsupported_lock:
+        if not _request_compression_unsupported:
+            logger.info("Backend doesn't accept compressed request bodies; sending them uncompressed.")
+        _request_compression_unsupported = True
@@ -0,0 +1,40 @@
+import os
+import threading
+
+_env_loaded = False
+_env_lock = threading.Lock()
+
+
+class ConfigError(ValueError):
+    """A required setting is missing or invalid."""
+
+
+def load_env():
+    """Load the .env file into os.environ the first time any setting is read."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _env_lock:
+        if not _env_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _env_loaded = True
+
+
+def env(name, default=None):
+    """os.getenv, with .env loaded first; real environment variables take precedence."""
+    load_env()
+    return os.getenv(name, default)
+
+
+def base_url():
+    """
+    The backend's base URL (BASE_URL).
+
+    Raises:
+        ConfigError: If BASE_URL is not set in the environment or the .env file.
+    """
+    url = env("BASE_URL")
+    if not url:
+        raise ConfigError("BASE_URL not found in the environment variables. Please configure it in your .env file.")
+    return url
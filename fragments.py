@@ -0,0 +1,46 @@
+import functools
+
+import streamlit as st
+
+from server_requests import backend_call_count, logger
+from repositories import begin_rerun, is_fragment_rerun
+
+
+def dashboard_fragment(name):
+    """
+    Run a dashboard section as an isolated Streamlit fragment.
+
+    Widgets inside the section only re-execute that section (not the header, sidebar
+    or the other sections), so an action like approving a meeting only re-fetches
+    what the section itself needs. Each run records how many backend calls it made
+    under st.session_state.fragment_stats[name], next to the "Full page" entry that
+    website.main records for whole-script reruns, so the two can be compared.
+    A fragment-only rerun also starts its own identity map (see repositories).
+
+    Args:
+        name (str): Label the stats are recorded under, e.g. "Teacher: Manage Meetings".
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            if is_fragment_rerun():
+                begin_rerun()
+            before = backend_call_count()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_backend_calls(name, backend_call_count() - before)
+
+        return st.fragment(run)
+
+    return decorate
+
+
+def record_backend_calls(name, calls):
+    """Accumulate per-run backend call counts for a page or section."""
+    stats = st.session_state.setdefault("fragment_stats", {})
+    entry = stats.setdefault(name, {"runs": 0, "backend_calls": 0, "last_run_calls": 0})
+    entry["runs"] += 1
+    entry["backend_calls"] += calls
+    entry["last_run_calls"] = calls
+    logger.debug("%s: %d backend call(s) this run.", name, calls)
@@ -0,0 +1,86 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from compression import accept_encoding
+from config import env
+
+# Only methods that are safe to replay are retried; a POST may have been applied
+# on the server even when the response never made it back to us.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def default_timeout():
+    """(connect, read) timeout in seconds, overridable with HTTP_CONNECT_TIMEOUT / HTTP_READ_TIMEOUT."""
+    return (
+        float(env("HTTP_CONNECT_TIMEOUT", "3.05")),
+        float(env("HTTP_READ_TIMEOUT", "30")),
+    )
+
+
+def build_session(pool_size=None, max_retries=None, backoff_factor=None):
+    """
+    Build a requests.Session with a keep-alive connection pool and retry policy.
+
+    Unset arguments fall back to HTTP_POOL_SIZE, HTTP_MAX_RETRIES and HTTP_BACKOFF_FACTOR
+    from the environment. Responses are requested compressed with every codec available
+    (see compression.accept_encoding).
+
+    Args:
+        pool_size (int): Maximum number of pooled connections per host.
+        max_retries (int): Retries for idempotent methods on connection errors and 502/503/504.
+        backoff_factor (float): Exponential backoff factor between retries.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    if pool_size is None:
+        pool_size = int(env("HTTP_POOL_SIZE", "10"))
+    if max_retries is None:
+        max_retries = int(env("HTTP_MAX_RETRIES", "3"))
+    if backoff_factor is None:
+        backoff_factor = float(env("HTTP_BACKOFF_FACTOR", "0.3"))
+
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        allowed_methods=IDEMPOTENT_METHODS,
+        status_forcelist=RETRY_STATUSES,
+        backoff_factor=backoff_factor,
+        respect_retry_after_header=True,
+        raise_on_status=False,  # hand the final response to handle_response
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.headers["Accept-Encoding"] = accept_encoding()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session():
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def reset_session():
+    """Close the shared session so the next call to get_session() builds a fresh pool."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
@@ -0,0 +1,245 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from datetime import datetime, timezone
+
+
+def _to_datetime(value):
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    raise TypeError(f"Expected datetime or ISO 8601 string, got {type(value).__name__}")
+
+
+def to_epoch(value):
+    """Convert a datetime or ISO string to epoch seconds; naive values are read as UTC wall time."""
+    dt = _to_datetime(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class IntervalSet:
+    """
+    A set of availability slots kept as sorted, non-overlapping [start, end) intervals.
+
+    Slots are stored as two parallel arrays of epoch seconds. Adding a slot merges it
+    with any slot it overlaps or touches, so lookups are a bisect away (O(log n))
+    instead of re-parsing every ISO string on each rerun.
+
+    Naive timestamps (what the backend stores today) round-trip as naive; if aware
+    timestamps are added, the set serializes back in the first timezone it saw.
+    """
+
+    def __init__(self, intervals=None):
+        self._starts = array("d")
+        self._ends = array("d")
+        self.tz = None
+        for start, end in intervals or []:
+            self.add(start, end)
+
+    @classmethod
+    def from_wire(cls, intervals):
+        """
+        Build a set from the API format: a list of {"start": ISO, "end": ISO} dicts (or
+        models.Interval records).
+
+        Entries that are not dicts, have unparsable timestamps or end before they start
+        are skipped.
+        """
+        interval_set = cls()
+        for item in intervals or []:
+            if not isinstance(item, Mapping):
+                continue
+            try:
+                interval_set.add(item.get("start"), item.get("end"))
+            except (TypeError, ValueError):
+                continue
+        return interval_set
+
+    def to_wire(self):
+        """Serialize back to the API format: [{"start": ISO, "end": ISO}, ...]."""
+        return [{"start": start.isoformat(), "end": end.isoformat()} for start, end in self]
+
+    def _to_datetime(self, epoch):
+        dt = datetime.fromtimestamp(epoch, timezone.utc)
+        return dt.replace(tzinfo=None) if self.tz is None else dt.astimezone(self.tz)
+
+    def _epochs(self, start, end):
+        start_dt, end_dt = _to_datetime(start), _to_datetime(end)
+        if self.tz is None and start_dt.tzinfo is not None and not self._starts:
+            self.tz = start_dt.tzinfo
+        start_epoch, end_epoch = to_epoch(start_dt), to_epoch(end_dt)
+        if end_epoch <= start_epoch:
+            raise ValueError("Interval end must be after its start.")
+        return start_epoch, end_epoch
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __bool__(self):
+        return bool(self._starts)
+
+    def __iter__(self):
+        for start, end in zip(self._starts, self._ends):
+            yield self._to_datetime(start), self._to_datetime(end)
+
+    def __getitem__(self, index):
+        return self._to_datetime(self._starts[index]), self._to_datetime(self._ends[index])
+
+    def epochs(self):
+        """Return copies of the (starts, ends) epoch-second arrays."""
+        return array("d", self._starts), array("d", self._ends)
+
+    def add(self, start, end):
+        """
+        Add a slot, merging it with every slot it overlaps or is adjacent to.
+
+        Returns:
+            int: Index of the (possibly merged) slot.
+        """
+        start, end = self._epochs(start, end)
+        # First slot ending at/after our start, and one past the last slot starting at/before our end.
+        i = bisect_left(self._ends, start)
+        j = bisect_right(self._starts, end)
+        if i < j:
+            start = min(start, self._starts[i])
+            end = max(end, self._ends[j - 1])
+            del self._starts[i:j]
+            del self._ends[i:j]
+        self._starts.insert(i, start)
+        self._ends.insert(i, end)
+        return i
+
+    def remove_at(self, index):
+        """Remove the slot at position `index` (as displayed)."""
+        del self._starts[index]
+        del self._ends[index]
+
+    def subtract(self, start, end):
+        """Remove the time range [start, end) from the set, splitting slots where needed."""
+        start, end = self._epochs(start, end)
+        i = bisect_right(self._ends, start)
+        j = bisect_left(self._starts, end)
+        if i >= j:
+            return
+        pieces = []
+        if self._starts[i] < start:
+            pieces.append((self._starts[i], start))
+        if self._ends[j - 1] > end:
+            pieces.append((end, self._ends[j - 1]))
+        del self._starts[i:j]
+        del self._ends[i:j]
+        for offset, (piece_start, piece_end) in enumerate(pieces):
+            self._starts.insert(i + offset, piece_start)
+            self._ends.insert(i + offset, piece_end)
+
+    def difference(self, other):
+        """
+        Return a new set with the time covered by `other` removed, in one linear sweep over
+        both sets (subtracting slots one by one would shift the arrays on every split).
+        """
+        result = IntervalSet()
+        result.tz = self.tz
+        j = 0
+        for start, end in zip(self._starts, self._ends):
+            while j < len(other._ends) and other._ends[j] <= start:
+                j += 1
+            cursor, k = start, j
+            while k < len(other._starts) and other._starts[k] < end:
+                if other._starts[k] > cursor:
+                    result._starts.append(cursor)
+                    result._ends.append(other._starts[k])
+                cursor = max(cursor, other._ends[k])
+                k += 1
+            if cursor < end:
+                result._starts.append(cursor)
+                result._ends.append(end)
+        return result
+
+    def overlapping(self, start, end):
+        """
+        Return the index range of slots that overlap [start, end).
+
+        Returns:
+            range: Indices i with starts[i] < end and ends[i] > start.
+        """
+        start, end = self._epochs(start, end)
+        return range(bisect_right(self._ends, start), bisect_left(self._starts, end))
+
+    def overlaps(self, start, end):
+        """True if any slot overlaps [start, end)."""
+        return len(self.overlapping(start, end)) > 0
+
+    def covers(self, start, end):
+        """True if a single slot contains the whole of [start, end)."""
+        start, end = self._epochs(start, end)
+        i = bisect_right(self._starts, start) - 1
+        return i >= 0 and self._ends[i] >= end
+
+    def gaps(self, start, end):
+        """
+        Return the free ranges inside [start, end) that no slot covers.
+
+        Returns:
+            list: (start, end) datetime tuples in chronological order.
+        """
+        start, end = self._epochs(start, end)
+        free = []
+        cursor = start
+        for i in range(bisect_right(self._ends, start), bisect_left(self._starts, end)):
+            if self._starts[i] > cursor:
+                free.append((cursor, self._starts[i]))
+            cursor = max(cursor, self._ends[i])
+        if cursor < end:
+            free.append((cursor, end))
+        return [(self._to_datetime(s), self._to_datetime(e)) for s, e in free]
+
+    def nearest_fits(self, start, end, limit=3, not_before=None):
+        """
+        Find where a slot as long as [start, end) fits inside the set, moved as little as possible.
+
+        Each slot in the set yields at most one placement (the one closest to `start`). The
+        search starts at the slot around `start` and walks outwards in both directions, always
+        taking the side whose next slot could be closer, so it visits O(log n + k) slots
+        rather than the whole set.
+
+        Args:
+            start, end: The requested range (datetime or ISO string).
+            limit (int): Maximum number of placements to return.
+            not_before: Placements may not start before this time (e.g. now).
+
+        Returns:
+            list: Up to `limit` (start, end) datetime tuples, nearest to `start` first.
+        """
+        start, end = self._epochs(start, end)
+        duration = end - start
+        floor = to_epoch(not_before) if not_before is not None else float("-inf")
+        left = bisect_right(self._starts, start) - 1  # the slot starting at/before start
+        right = left + 1
+        found = []  # (distance, placement start)
+
+        def distance_bound(i, side):
+            # No placement in slot i can be closer than this.
+            if side < 0:
+                return max(0.0, start - (self._ends[i] - duration))
+            return max(self._starts[i], floor) - start
+
+        while left >= 0 or right < len(self._starts):
+            left_bound = distance_bound(left, -1) if left >= 0 else float("inf")
+            right_bound = distance_bound(right, 1) if right < len(self._starts) else float("inf")
+            if len(found) >= limit and min(left_bound, right_bound) >= found[-1][0]:
+                break
+            if left_bound <= right_bound:
+                i, left = left, left - 1
+                if self._ends[i] - duration < floor:
+                    left = -1  # this slot and everything before it ends too early
+            else:
+                i, right = right, right + 1
+            placement = max(min(start, self._ends[i] - duration), self._starts[i], floor)
+            if placement + duration <= self._ends[i]:
+                found.append((abs(placement - start), placement))
+                found.sort()
+                del found[limit:]
+        return [(self._to_datetime(s), self._to_datetime(s + duration)) for _, s in found]
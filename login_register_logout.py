@@ -1,4 +1,7 @@
-from server_requests import *
+import streamlit as st
+
+from request_logging import Redacted
+from server_requests import send_data, logger
 
 
 def login(email, password):
@@ -19,11 +22,11 @@ def login(email, password):
         #st.write("Login response:", result)  # 🔍 Debug output
 
         if result and "user_id" in result:
-            logger.info(f"Login successful for user {email}")
+            logger.info("Login successful for user %s", result["user_id"])
             st.session_state.user_id = result["user_id"]
             return result
         elif result and "detail" in result:
-            logger.error(f"Login failed: {result['detail']}")
+            logger.error("Login failed: %s", Redacted(result["detail"]))
             st.error(result["detail"])
             return None
         else:
@@ -31,7 +34,7 @@ def login(email, password):
             st.error("Login failed. Please try again.")
             return None
     except Exception as e:
-        logger.exception(f"Login failed due to an unexpected error: {e}")
+        logger.exception("Login failed due to an unexpected error: %s", e)
         st.error("An unexpected error occurred. Please try again later.")
         return None
 
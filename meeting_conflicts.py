@@ -0,0 +1,128 @@
+import operator
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import date, datetime, time, timedelta
+from functools import partial
+
+from intervals import IntervalSet
+from repositories import meeting_repo, teacher_repo
+
+# Meetings in these states no longer hold the teacher's time.
+RELEASED_STATUSES = {"Canceled"}
+
+# Why a requested slot can't be booked (see TeacherSchedule.conflict).
+CONFLICT_BOOKED = "booked"
+CONFLICT_UNAVAILABLE = "unavailable"
+
+# A teacher who hasn't published availability is treated as free around their booked time;
+# suggestions are then searched this far either side of the requested slot.
+SUGGESTION_WINDOW = timedelta(days=14)
+
+# Built schedules kept for reuse, least recently used teacher evicted first (see teacher_schedule)
+SCHEDULE_CACHE_SIZE = 256
+
+_schedules = OrderedDict()
+_schedules_lock = threading.Lock()
+# Set once the backend answers /teachers/{id}/busy with 404, so it isn't asked again
+_busy_endpoint_missing = False
+
+
+class TeacherSchedule:
+    """
+    A teacher's published availability and booked time, to vet a meeting request
+    before it is sent.
+
+    availability, booked and free (availability minus booked) are IntervalSets: merged,
+    sorted intervals in flat arrays, so a requested slot is checked with a few bisections,
+    O(log n) however long the teacher's calendar is, and the nearest free slots are found
+    by walking outwards from the requested one.
+
+    Args:
+        available (list): The teacher's "available" intervals, in the API format.
+        busy (list): The teacher's booked time, in the same format (see TeacherRepo.busy).
+        meetings (list): Meeting documents the teacher takes part in, when the backend has
+            no busy endpoint; canceled ones and ones without a full start/finish timestamp
+            are ignored.
+    """
+
+    def __init__(self, available=None, busy=None, meetings=None):
+        self.availability = IntervalSet.from_wire(available)
+        self.booked = IntervalSet.from_wire(busy)
+        for meeting in meetings or []:
+            if not isinstance(meeting, Mapping) or meeting.get("status") in RELEASED_STATUSES:
+                continue
+            try:
+                self.booked.add(meeting.get("start_time"), meeting.get("finish_time"))
+            except (TypeError, ValueError):
+                continue  # e.g. time-of-day-only requests made before dates were asked for
+        self.free = self.availability.difference(self.booked)
+
+    def conflict(self, start, end):
+        """
+        Check a requested slot.
+
+        Returns:
+            tuple or None: None if the slot can be booked, else (reason, clash) where reason
+            is CONFLICT_BOOKED, with clash the (start, end) of the booked time it overlaps,
+            or CONFLICT_UNAVAILABLE (outside the published availability), with clash None.
+        """
+        overlapping = self.booked.overlapping(start, end)
+        if overlapping:
+            return CONFLICT_BOOKED, self.booked[overlapping[0]]
+        if self.availability and not self.availability.covers(start, end):
+            return CONFLICT_UNAVAILABLE, None
+        return None
+
+    def suggest(self, start, end, limit=3, not_before=None):
+        """
+        The free slots of the same length closest to the requested one.
+
+        Returns:
+            list: Up to `limit` (start, end) datetime tuples, nearest first.
+        """
+        if self.availability:
+            return self.free.nearest_fits(start, end, limit, not_before)
+        window = IntervalSet(self.booked.gaps(start - SUGGESTION_WINDOW, end + SUGGESTION_WINDOW))
+        return window.nearest_fits(start, end, limit, not_before)
+
+
+def teacher_schedule(teacher):
+    """
+    The schedule of a teacher document from today on; meetings that started before today
+    can't clash with a new request, so they aren't fetched.
+
+    Booked time comes from /teachers/{id}/busy when the backend has it (start/end only,
+    without the meetings' details), else from the teacher's meetings.
+
+    Schedules are kept per teacher (SCHEDULE_CACHE_SIZE) and reused for as long as their
+    inputs are the same objects, i.e. until the response cache refetches one, so reruns
+    of the request form don't rebuild the interval sets.
+    """
+    global _busy_endpoint_missing
+    teacher_id = teacher.get("id")
+    if not teacher_id:
+        return TeacherSchedule(teacher.get("available"))
+    available = teacher.get("available")
+    today = datetime.combine(date.today(), time())
+    busy = None if _busy_endpoint_missing else teacher_repo.busy(teacher_id, today)
+    if busy is None:
+        _busy_endpoint_missing = True
+    if isinstance(busy, list):
+        sources, build = tuple(busy), partial(TeacherSchedule, available, busy)
+    else:
+        meetings = meeting_repo.since(teacher_id, today) or []
+        sources, build = tuple(meetings), partial(TeacherSchedule, available, meetings=meetings)
+    with _schedules_lock:
+        cached = _schedules.get(teacher_id)
+        if cached is not None and cached[0] is available and len(cached[1]) == len(sources) \
+                and all(map(operator.is_, cached[1], sources)):
+            _schedules.move_to_end(teacher_id)
+            return cached[2]
+    schedule = build()
+    with _schedules_lock:
+        _schedules[teacher_id] = (available, sources, schedule)
+        _schedules.move_to_end(teacher_id)
+        while len(_schedules) > SCHEDULE_CACHE_SIZE:
+            _schedules.popitem(last=False)
+    return schedule
@@ -0,0 +1,236 @@
+import json
+import logging
+import random
+import threading
+import time
+
+import streamlit as st
+
+from config import base_url, env
+from server_requests import invalidate_cache
+
+logger = logging.getLogger(__name__)
+
+STREAM_ENDPOINT = "/meetings/stream"
+
+# How often an open meetings page checks its stream for news (no network involved)
+STREAM_POLL_SECONDS = 1.0
+
+_streams = {}
+_streams_lock = threading.Lock()
+_stream_unsupported = False
+
+
+class MeetingStream:
+    """
+    A user's meeting changes, pushed by the backend as server-sent events.
+
+    A daemon thread keeps a GET /meetings/stream?user_id= open and records the latest
+    status of every meeting it hears about, so open dashboards learn about an approval
+    without refetching the meeting list. It reconnects with exponential backoff (and
+    Last-Event-ID, so nothing is missed) when the connection drops, and exits once nobody
+    has polled it for `idle_timeout` seconds.
+
+    Args:
+        url (str): Stream URL, including the user_id query parameter.
+        token (str): Bearer token sent with the subscription.
+        idle_timeout (float): Stop after this long without a poll() from a page.
+        read_timeout (float): Reconnect if nothing, not even a heartbeat, arrives for this long.
+        max_backoff (float): Upper bound for the delay between reconnects.
+    """
+
+    def __init__(self, url, token, idle_timeout=60.0, read_timeout=45.0, max_backoff=30.0):
+        self.url = url
+        self.token = token
+        self.idle_timeout = idle_timeout
+        self.read_timeout = read_timeout
+        self.max_backoff = max_backoff
+        self.version = 0
+        self.unsupported = False
+        self._statuses = {}
+        self._last_event_id = None
+        self._last_poll = time.monotonic()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="meeting-stream")
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def alive(self):
+        return self._thread.is_alive()
+
+    def poll(self):
+        """
+        Keep the stream open and return what it has heard so far.
+
+        Returns:
+            tuple: (version, {meeting id: status}); the version grows with every event.
+        """
+        with self._lock:
+            self._last_poll = time.monotonic()
+            return self.version, dict(self._statuses)
+
+    def _idle(self):
+        return time.monotonic() - self._last_poll > self.idle_timeout
+
+    def _run(self):
+        attempts = 0
+        while not self._idle():
+            try:
+                if self._listen():
+                    attempts = 0
+            except Exception as e:
+                logger.warning("Meeting stream %s dropped: %s", STREAM_ENDPOINT, e)
+            if self.unsupported or self._idle():
+                break
+            attempts += 1
+            time.sleep(min(self.max_backoff, 2 ** (attempts - 1)) * random.uniform(0.8, 1.2))
+        logger.debug("Meeting stream closed (%s).", "unsupported" if self.unsupported else "idle")
+
+    def _listen(self):
+        """Read one connection until it ends; returns True if it delivered anything."""
+        import requests
+        from http_client import default_timeout
+
+        headers = {"Accept": "text/event-stream", "Authorization": f"Bearer {self.token}"}
+        if self._last_event_id:
+            headers["Last-Event-ID"] = self._last_event_id
+        # A connection of its own: a pooled one would be held for as long as the page is open.
+        with requests.get(self.url, headers=headers, stream=True,
+                          timeout=(default_timeout()[0], self.read_timeout)) as response:
+            if response.status_code in (404, 405, 501):
+                logger.info("No %s on the backend; meeting updates show up on refresh only.", STREAM_ENDPOINT)
+                self.unsupported = True
+                return False
+            if response.status_code >= 400:
+                logger.warning("Meeting stream refused: %s", response.status_code)
+                return False
+            received = False
+            event, data = None, []
+            for line in _lines(response):
+                if self._idle():
+                    break
+                received = True
+                if line == "":
+                    if data:
+                        self._dispatch(event, "\n".join(data))
+                    event, data = None, []
+                    continue
+                if line.startswith(":"):
+                    continue  # heartbeat
+                field, _, value = line.partition(":")
+                value = value[1:] if value.startswith(" ") else value
+                if field == "event":
+                    event = value
+                elif field == "data":
+                    data.append(value)
+                elif field == "id":
+                    self._last_event_id = value
+            return received
+
+    def _dispatch(self, event, data):
+        if event != "meeting":
+            return
+        try:
+            change = json.loads(data)
+        except ValueError:
+            logger.warning("Ignoring malformed meeting event: %.200s", data)
+            return
+        if not isinstance(change, dict) or not change.get("id"):
+            return
+        if change.get("type") == "created":
+            # A new meeting changes the lists themselves; refetch them on the next rerun.
+            invalidate_cache(f"/meetings/{change['id']}")
+        with self._lock:
+            if change.get("status"):
+                self._statuses[change["id"]] = change["status"]
+            self.version += 1
+
+
+def _lines(response):
+    """
+    Yield the decoded lines of a streamed response as soon as each one arrives.
+
+    Response.iter_lines waits for a full chunk (512 bytes) before yielding, which would
+    hold a short event back until the next ones filled the buffer; read1 returns whatever
+    has arrived instead (urllib3 2; older versions fall back to reading byte by byte).
+    """
+    if not hasattr(response.raw, "read1"):
+        yield from response.iter_lines(chunk_size=1, decode_unicode=True)
+        return
+    buffer = b""
+    while True:
+        chunk = response.raw.read1(8192)
+        if not chunk:
+            break
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r").decode("utf-8", "replace")
+
+
+def stream_for(user_id, token):
+    """
+    The running MeetingStream of `user_id`, shared by all of their sessions and started on
+    first use, or None if streaming is off (MEETING_STREAM=0) or the backend doesn't have it.
+    """
+    global _stream_unsupported
+    if _stream_unsupported or not user_id or env("MEETING_STREAM", "1") == "0":
+        return None
+    with _streams_lock:
+        stream = _streams.get(user_id)
+        if stream is not None and stream.unsupported:
+            _stream_unsupported = True
+            return None
+        if stream is None or not stream.alive():
+            stream = _streams[user_id] = MeetingStream(
+                f"{base_url()}{STREAM_ENDPOINT}?user_id={user_id}", token,
+                idle_timeout=float(env("MEETING_STREAM_IDLE_SECONDS", "60")),
+            ).start()
+        return stream
+
+
+def apply_meeting_deltas(meetings):
+    """
+    Overlay the statuses pushed since the meetings were loaded (see watch_meeting_stream).
+
+    Args:
+        meetings (list): Meeting documents as loaded (not modified).
+
+    Returns:
+        list: The meetings, with pushed statuses applied.
+    """
+    deltas = st.session_state.get("meeting_deltas")
+    if not deltas:
+        return list(meetings or [])
+    return [{**meeting, "status": deltas[meeting.get("id")]} if meeting.get("id") in deltas else meeting
+            for meeting in meetings or []]
+
+
+def watch_meeting_stream():
+    """
+    Keep the page's meetings current: every STREAM_POLL_SECONDS, merge the statuses the
+    user's stream has received into st.session_state.meeting_deltas and rerun the app if
+    any arrived. Renders nothing; does nothing if the backend can't stream.
+    """
+    if stream_for(st.session_state.get("user_id"), st.session_state.get("token", "")) is not None:
+        _meeting_stream_watcher()
+
+
+@st.fragment(run_every=STREAM_POLL_SECONDS)
+def _meeting_stream_watcher():
+    stream = stream_for(st.session_state.get("user_id"), st.session_state.get("token", ""))
+    if stream is None:
+        return
+    version, statuses = stream.poll()
+    seen = st.session_state.get("meeting_stream_seen")
+    st.session_state.meeting_stream_seen = (id(stream), version)
+    if seen is None or seen[0] != id(stream):
+        # A new subscription: whatever an earlier one pushed may have been overtaken by
+        # changes nobody was listening for, and the page has just loaded fresh meetings.
+        st.session_state.meeting_deltas = statuses
+        return
+    if version != seen[1]:
+        st.session_state.setdefault("meeting_deltas", {}).update(statuses)
+        st.rerun()
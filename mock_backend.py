@@ -0,0 +1,572 @@
+"""
+Local stand-in for the tutoring API, with a seeded synthetic data generator.
+
+Run it and point the app at it:
+
+    python mock_backend.py --users 10000 --port 8000
+    BASE_URL=http://127.0.0.1:8000 streamlit run website.py
+
+Every generated user can log in with the password "password". Latency and failures
+can be injected with --latency-ms / --jitter-ms / --error-rate.
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import models
+from compression import CODECS, compress, decompress
+
+SUBJECTS = [subject.lower() for subject in models.SUBJECTS]  # what the profile editors offer
+FIRST_NAMES = ["Adam", "Noa", "Yael", "Omer", "Maya", "Daniel", "Tamar", "Itai", "Shira", "Lior", "Dana", "Eitan"]
+LAST_NAMES = ["Cohen", "Levi", "Mizrahi", "Peretz", "Biton", "Friedman", "Katz", "Azulay", "Malka", "Shapiro"]
+MEETING_STATUSES = ["Pending", "Approved", "Canceled"]
+DEFAULT_PASSWORD = "password"
+
+
+def _new_id():
+    return uuid.uuid4().hex[:24]
+
+
+class MockStore:
+    """In-memory documents for users, students, teachers and meetings."""
+
+    def __init__(self):
+        self.users = {}
+        self.students = {}
+        self.teachers = {}
+        self.meetings = {}
+        self.meetings_by_user = {}
+        self.lock = threading.RLock()
+        # Meeting changes made through the API, in order; event i has id i + 1 (see meeting_stream).
+        self.meeting_events = []
+        self.meetings_changed = threading.Condition(self.lock)
+
+    def add_meeting(self, meeting):
+        with self.lock:
+            self.meetings[meeting["id"]] = meeting
+            for person in meeting.get("people", []):
+                person_id = person.get("id") if isinstance(person, dict) else person
+                self.meetings_by_user.setdefault(person_id, []).append(meeting["id"])
+
+    def record_meeting_event(self, kind, meeting):
+        """Append a "created"/"updated" event for `meeting` and wake the streams waiting for one."""
+        with self.meetings_changed:
+            people = [p.get("id") if isinstance(p, dict) else p for p in meeting.get("people", [])]
+            self.meeting_events.append({"type": kind, "id": meeting["id"], "status": meeting.get("status"),
+                                        "people": people})
+            self.meetings_changed.notify_all()
+
+    def public_user(self, user):
+        return {key: value for key, value in user.items() if key != "password"}
+
+
+def _slots(rng, start, count):
+    """Non-overlapping one-to-three hour slots on distinct days, as the app stores them."""
+    days = rng.sample(range(60), count)
+    slots = []
+    for day in sorted(days):
+        begin = start + timedelta(days=day, hours=rng.randint(8, 18))
+        slots.append({"start": begin.isoformat(), "end": (begin + timedelta(hours=rng.randint(1, 3))).isoformat()})
+    return slots
+
+
+def generate_dataset(users=1000, seed=0, teacher_share=0.3, student_share=0.8, slots_per_profile=5,
+                     meetings_per_student=3, start=None):
+    """
+    Generate a reproducible dataset.
+
+    Args:
+        users (int): Number of user accounts.
+        seed (int): RNG seed; the same seed always yields the same data.
+        teacher_share (float): Fraction of users with a teacher profile.
+        student_share (float): Fraction of users with a student profile.
+        slots_per_profile (int): Availability slots per student/teacher profile.
+        meetings_per_student (int): Meetings booked by each student with random teachers.
+        start (datetime): First day availability and meetings may fall on.
+
+    Returns:
+        MockStore: The populated store.
+    """
+    rng = random.Random(seed)
+    start = start or datetime(2025, 1, 6)
+    store = MockStore()
+
+    for i in range(users):
+        user_id = f"{i:024x}"
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        email = f"user{i}@example.com"
+        store.users[user_id] = {
+            "id": user_id, "name": name, "username": f"user{i}", "email": email,
+            "password": DEFAULT_PASSWORD, "roles": [], "phone": f"05{rng.randint(10000000, 99999999)}",
+            "about_section": "",
+        }
+        profile = {
+            "id": user_id, "name": name, "email": email, "phone": store.users[user_id]["phone"],
+            "about_section": f"Hi, I'm {name.split()[0]}.", "meetings": [],
+        }
+        if rng.random() < teacher_share:
+            store.teachers[user_id] = {
+                **profile,
+                "available": _slots(rng, start, slots_per_profile),
+                "subjects_to_teach": rng.sample(SUBJECTS, rng.randint(1, 3)),
+                "hourly_rate": rng.choice(range(20, 121, 5)),
+                "rating": round(rng.uniform(2.5, 5.0), 1),
+            }
+        if rng.random() < student_share:
+            store.students[user_id] = {
+                **profile,
+                "available": _slots(rng, start, slots_per_profile),
+                "subjects_interested_in_learning": rng.sample(SUBJECTS, rng.randint(1, 3)),
+                "rating": 0,
+            }
+
+    teacher_ids = list(store.teachers)
+    for student_id, student in store.students.items():
+        for _ in range(meetings_per_student if teacher_ids else 0):
+            teacher = store.teachers[rng.choice(teacher_ids)]
+            begin = start + timedelta(days=rng.randint(0, 59), hours=rng.randint(8, 19))
+            meeting_id = f"{rng.getrandbits(96):024x}"
+            store.add_meeting(_meeting_document(meeting_id, {
+                "subject": rng.choice(teacher["subjects_to_teach"]),
+                "location": "Online",
+                "start_time": begin.isoformat(),
+                "finish_time": (begin + timedelta(hours=1)).isoformat(),
+                "people": [
+                    {"id": teacher["id"], "role": "Teacher", "name": teacher["name"]},
+                    {"id": student_id, "role": "Student", "name": student["name"]},
+                ],
+                "attached_files": [],
+                "status": rng.choice(MEETING_STATUSES),
+            }))
+            teacher["meetings"].append(meeting_id)
+            student["meetings"].append(meeting_id)
+    return store
+
+
+def _meeting_document(meeting_id, data):
+    """Store a meeting, filling in the display fields the dashboards read."""
+    people = data.get("people", [])
+    by_role = {p.get("role"): p for p in people if isinstance(p, dict)}
+    return {
+        "status": "Pending",
+        **data,
+        "id": meeting_id,
+        "topic": data.get("subject"),
+        "teacher_name": by_role.get("Teacher", {}).get("name"),
+        "student_name": by_role.get("Student", {}).get("name"),
+        "scheduled_time": data.get("start_time"),
+    }
+
+
+class UnsupportedEncoding(Exception):
+    """A request body came with a Content-Encoding the server won't read."""
+
+
+class MockBackendHandler(BaseHTTPRequestHandler):
+    """Routes requests to the server's MockStore. Configuration lives on self.server."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API behind its proxy
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    # --- plumbing -----------------------------------------------------------
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return None
+        body = self.rfile.read(length)
+        encoding = self.headers.get("Content-Encoding", "identity").strip().lower()
+        if encoding != "identity":
+            if not self.server.compression or encoding not in CODECS:
+                raise UnsupportedEncoding(encoding)
+            body = decompress(body, encoding)
+        return json.loads(body or b"null")
+
+    def _response_encoding(self, size):
+        """The first of CODECS the client accepts, if compression is on and the body is big enough."""
+        if not self.server.compression or size < self.server.compress_min_bytes:
+            return None
+        accepted = set()
+        for item in self.headers.get("Accept-Encoding", "").lower().split(","):
+            coding, *params = [part.strip() for part in item.split(";")]
+            try:
+                quality = next((float(param[2:]) for param in params if param.startswith("q=")), 1.0)
+            except ValueError:
+                continue
+            if quality > 0:
+                accepted.add(coding)
+        return next((coding for coding in CODECS if coding in accepted or "*" in accepted), None)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        encoding = self._response_encoding(len(body))
+        if encoding:
+            etag = "W/" + etag  # same document, different bytes
+        if status == 200 and self.command == "GET" and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if self.command == "GET" and status == 200:
+            self.send_header("ETag", etag)
+        if self.server.compression:
+            self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            body = compress(body, encoding)
+            self.send_header("Content-Encoding", encoding)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        chunk_size = self.server.chunk_size
+        if not chunk_size or len(body) <= chunk_size:
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        # Chunked transfer, paced like a large collection coming from a slow database.
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for start in range(0, len(body), chunk_size):
+            if start and self.server.chunk_delay_ms:
+                time.sleep(self.server.chunk_delay_ms / 1000.0)
+            chunk = body[start:start + chunk_size]
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _not_found(self, what="Not found"):
+        self._send_json(404, {"detail": what})
+
+    def _dispatch(self):
+        server = self.server
+        if server.latency_ms or server.jitter_ms:
+            time.sleep((server.latency_ms + server.rng.uniform(0, server.jitter_ms)) / 1000.0)
+        if server.error_rate and server.rng.random() < server.error_rate:
+            # Drain the body first, or it would be read as the next request on this keep-alive connection.
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            self._send_json(503, {"detail": "Injected failure"})
+            return
+
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        path = url.path.rstrip("/") or "/"
+        for method, pattern, handler in ROUTES:
+            match = pattern.fullmatch(path)
+            if match and method == self.command:
+                try:
+                    handler(self, query, *match.groups())
+                except UnsupportedEncoding as e:
+                    self._send_json(415, {"detail": f"Unsupported Content-Encoding: {e}"})
+                except (json.JSONDecodeError, ValueError) as e:
+                    self._send_json(422, {"detail": f"Invalid request: {e}"})
+                return
+        self._not_found()
+
+    do_GET = do_POST = do_PUT = do_DELETE = lambda self: self._dispatch()
+
+    # --- endpoints ----------------------------------------------------------
+
+    def _page(self, records, query):
+        skip = int(query.get("skip", 0))
+        limit = query.get("limit")
+        return records[skip:skip + int(limit)] if limit is not None else records[skip:]
+
+    def register(self, query):
+        data = self._read_json() or {}
+        store = self.server.store
+        with store.lock:
+            if any(user["email"] == data.get("email") for user in store.users.values()):
+                self._send_json(400, {"detail": "Email already registered"})
+                return
+            user_id = _new_id()
+            store.users[user_id] = {"id": user_id, "about_section": "", "phone": "", **data}
+        self._send_json(201, {"user_id": user_id, "name": data.get("name")})
+
+    def login(self, query):
+        data = self._read_json() or {}
+        store = self.server.store
+        with store.lock:
+            user = next((u for u in store.users.values() if u["email"] == data.get("email")), None)
+        if user is None or user.get("password") != data.get("password"):
+            self._send_json(401, {"detail": "Invalid email or password"})
+            return
+        self._send_json(200, {"user_id": user["id"], "name": user["name"], "access_token": _new_id()})
+
+    def get_user(self, query, user_id):
+        user = self.server.store.users.get(user_id)
+        if user is None:
+            self._not_found("User not found")
+        else:
+            self._send_json(200, self.server.store.public_user(user))
+
+    def update_user(self, query, user_id):
+        data = self._read_json() or {}
+        store = self.server.store
+        with store.lock:
+            user = store.users.get(user_id)
+            if user is None:
+                self._not_found("User not found")
+                return
+            user.update({key: value for key, value in data.items() if key != "id"})
+        self._send_json(200, store.public_user(user))
+
+    def _collection(self, name):
+        return getattr(self.server.store, name)
+
+    def list_documents(self, query, name):
+        with self.server.store.lock:
+            records = list(self._collection(name).values())
+        self._send_json(200, self._page(records, query))
+
+    def get_document(self, query, name, doc_id):
+        document = self._collection(name).get(doc_id)
+        if document is None:
+            self._not_found(f"{name[:-1].title()} not found")
+        else:
+            self._send_json(200, document)
+
+    def create_document(self, query, name):
+        data = self._read_json() or {}
+        store = self.server.store
+        with store.lock:
+            doc_id = str(data.get("id") or _new_id())
+            if name == "meetings":
+                document = _meeting_document(doc_id, data)
+                store.add_meeting(document)
+                store.record_meeting_event("created", document)
+            else:
+                if doc_id in self._collection(name):
+                    self._send_json(400, {"detail": f"{name[:-1].title()} already exists"})
+                    return
+                document = {**data, "id": doc_id}
+                self._collection(name)[doc_id] = document
+        self._send_json(201, document)
+
+    def update_document(self, query, name, doc_id):
+        data = self._read_json() or {}
+        store = self.server.store
+        with store.lock:
+            document = self._collection(name).get(doc_id)
+            if document is None:
+                self._not_found(f"{name[:-1].title()} not found")
+                return
+            document.update({key: value for key, value in data.items() if key != "id"})
+            if name == "meetings":
+                store.record_meeting_event("updated", document)
+        self._send_json(200, document)
+
+    def bulk_update_meetings(self, query):
+        """{"updates": [{"id", "status"}, ...]} -> {"results": [{"id", "ok", "meeting" | "detail"}, ...]}"""
+        if not self.server.bulk_updates:
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            self._not_found()
+            return
+        data = self._read_json() or {}
+        store = self.server.store
+        results = []
+        with store.lock:
+            for update in data.get("updates", []):
+                meeting = store.meetings.get(update.get("id"))
+                if meeting is None:
+                    results.append({"id": update.get("id"), "ok": False, "detail": "Meeting not found"})
+                elif update.get("status") not in MEETING_STATUSES:
+                    results.append({"id": update.get("id"), "ok": False, "detail": "Invalid status"})
+                else:
+                    meeting["status"] = update["status"]
+                    store.record_meeting_event("updated", meeting)
+                    results.append({"id": meeting["id"], "ok": True, "meeting": meeting})
+        self._send_json(200, {"results": results})
+
+    def meeting_stream(self, query):
+        """
+        Server-sent events for the meetings of ?user_id=: one "meeting" event per change,
+        data {"type": "created" | "updated", "id", "status"}, and a comment line as a
+        heartbeat when nothing happened for stream_heartbeat seconds. A reconnecting
+        client sends Last-Event-ID and gets the events it missed.
+        """
+        user_id = query.get("user_id")
+        if not user_id or not self.server.meeting_stream:
+            self._not_found()
+            return
+        store = self.server.store
+        last_seen = self.headers.get("Last-Event-ID") or query.get("last_event_id") or ""
+        with store.lock:
+            cursor = int(last_seen) if last_seen.isdigit() else len(store.meeting_events)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")  # no Content-Length: the body ends when we hang up
+        self.end_headers()
+        self.close_connection = True
+        while True:
+            with store.meetings_changed:
+                if cursor >= len(store.meeting_events):
+                    store.meetings_changed.wait(self.server.stream_heartbeat)
+                events = store.meeting_events[cursor:]
+                start, cursor = cursor, len(store.meeting_events)
+            chunk = "".join(
+                f"id: {start + offset + 1}\nevent: meeting\n"
+                f"data: {json.dumps({k: v for k, v in event.items() if k != 'people'})}\n\n"
+                for offset, event in enumerate(events) if user_id in event["people"])
+            try:
+                self.wfile.write((chunk or ": keepalive\n\n").encode())
+                self.wfile.flush()
+            except OSError:  # the client went away
+                return
+
+    def teacher_busy(self, query, teacher_id):
+        """A teacher's booked time (non-canceled meetings ending after ?start=), without the meetings' details."""
+        store = self.server.store
+        with store.lock:
+            if teacher_id not in store.teachers:
+                self._not_found("Teacher not found")
+                return
+            meetings = [store.meetings[m] for m in store.meetings_by_user.get(teacher_id, []) if m in store.meetings]
+        busy = sorted(({"start": m["start_time"], "end": m["finish_time"]} for m in meetings
+                       if m.get("status") != "Canceled" and isinstance(m.get("start_time"), str)
+                       and isinstance(m.get("finish_time"), str) and m["finish_time"] > query.get("start", "")),
+                      key=lambda slot: slot["start"])
+        self._send_json(200, busy)
+
+    def user_meetings(self, query, user_id):
+        store = self.server.store
+        with store.lock:
+            meetings = [store.meetings[m] for m in store.meetings_by_user.get(user_id, []) if m in store.meetings]
+        if query.get("status"):
+            meetings = [m for m in meetings if m.get("status") == query["status"]]
+        if query.get("start"):
+            meetings = [m for m in meetings if m.get("start_time", "") >= query["start"]]
+        if query.get("end"):
+            meetings = [m for m in meetings if m.get("start_time", "") < query["end"]]
+        self._send_json(200, self._page(meetings, query))
+
+
+_COLLECTIONS = "(students|teachers|meetings)"
+ROUTES = [
+    ("POST", re.compile(r"/users"), MockBackendHandler.register),
+    ("POST", re.compile(r"/users/login"), MockBackendHandler.login),
+    ("GET", re.compile(r"/users/id/([^/]+)"), MockBackendHandler.get_user),
+    ("PUT", re.compile(r"/users/([^/]+)"), MockBackendHandler.update_user),
+    ("GET", re.compile(r"/meetings/user/([^/]+)"), MockBackendHandler.user_meetings),
+    ("GET", re.compile(r"/teachers/([^/]+)/busy"), MockBackendHandler.teacher_busy),
+    ("POST", re.compile(r"/meetings/bulk"), MockBackendHandler.bulk_update_meetings),
+    ("GET", re.compile(r"/meetings/stream"), MockBackendHandler.meeting_stream),
+    ("GET", re.compile(f"/{_COLLECTIONS}"), MockBackendHandler.list_documents),
+    ("POST", re.compile(f"/{_COLLECTIONS}"), MockBackendHandler.create_document),
+    ("GET", re.compile(f"/{_COLLECTIONS}/([^/]+)"), MockBackendHandler.get_document),
+    ("PUT", re.compile(f"/{_COLLECTIONS}/([^/]+)"), MockBackendHandler.update_document),
+]
+
+
+def make_server(store, host="127.0.0.1", port=8000, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0,
+                seed=0, verbose=False, bulk_updates=True, meeting_stream=True, stream_heartbeat=15.0,
+                chunk_size=0, chunk_delay_ms=0.0, compression=True, compress_min_bytes=1024):
+    """
+    Build (but don't start) a threaded mock API server.
+
+    Args:
+        store (MockStore): Data to serve, e.g. from generate_dataset().
+        latency_ms (float): Fixed delay added to every request.
+        jitter_ms (float): Extra uniformly random delay, 0..jitter_ms.
+        error_rate (float): Probability (0-1) of answering 503 instead of handling the request.
+        seed (int): Seed for the jitter and error injection RNG.
+        verbose (bool): Log every request to stderr.
+        bulk_updates (bool): Serve POST /meetings/bulk; False answers 404 like an older API.
+        meeting_stream (bool): Serve GET /meetings/stream (server-sent events); False answers 404.
+        stream_heartbeat (float): Seconds of silence after which a stream sends a keepalive comment.
+        chunk_size (int): Send JSON bodies larger than this many bytes with chunked transfer
+            encoding; 0 always sends a Content-Length.
+        chunk_delay_ms (float): Pause between chunks, to watch a large response arrive.
+        compression (bool): Compress responses with a codec the client accepts and read
+            compressed request bodies; False answers those with 415, like an API without it.
+        compress_min_bytes (int): Send smaller responses uncompressed.
+    """
+    server = ThreadingHTTPServer((host, port), MockBackendHandler)
+    server.daemon_threads = True
+    server.store = store
+    server.latency_ms = latency_ms
+    server.jitter_ms = jitter_ms
+    server.error_rate = error_rate
+    server.rng = random.Random(seed)
+    server.verbose = verbose
+    server.bulk_updates = bulk_updates
+    server.meeting_stream = meeting_stream
+    server.stream_heartbeat = stream_heartbeat
+    server.chunk_size = chunk_size
+    server.chunk_delay_ms = chunk_delay_ms
+    server.compression = compression
+    server.compress_min_bytes = compress_min_bytes
+    return server
+
+
+def serve_in_thread(store, **kwargs):
+    """
+    Start a mock server on a background thread (port 0 picks a free port).
+
+    Returns:
+        tuple: (server, base_url); call server.shutdown() when done.
+    """
+    kwargs.setdefault("port", 0)
+    server = make_server(store, **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the tutoring API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--users", type=int, default=1000, help="number of synthetic users to generate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--slots", type=int, default=5, help="availability slots per profile")
+    parser.add_argument("--meetings-per-student", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--no-bulk", action="store_true", help="answer 404 to POST /meetings/bulk")
+    parser.add_argument("--no-stream", action="store_true", help="answer 404 to GET /meetings/stream")
+    parser.add_argument("--chunk-size", type=int, default=0,
+                        help="send JSON bodies over this many bytes with chunked transfer encoding")
+    parser.add_argument("--chunk-delay-ms", type=float, default=0.0, help="pause between chunks")
+    parser.add_argument("--no-compression", action="store_true",
+                        help="send identity responses and answer 415 to compressed request bodies")
+    parser.add_argument("--compress-min-bytes", type=int, default=1024)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    store = generate_dataset(args.users, seed=args.seed, slots_per_profile=args.slots,
+                             meetings_per_student=args.meetings_per_student)
+    print(f"Generated {len(store.users)} users, {len(store.teachers)} teachers, {len(store.students)} students "
+          f"and {len(store.meetings)} meetings in {time.perf_counter() - started:.1f}s")
+
+    server = make_server(store, args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate,
+                         args.seed, args.verbose, not args.no_bulk, not args.no_stream,
+                         chunk_size=args.chunk_size, chunk_delay_ms=args.chunk_delay_ms,
+                         compression=not args.no_compression, compress_min_bytes=args.compress_min_bytes)
+    print(f"Serving on http://{args.host}:{args.port} (BASE_URL) — Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
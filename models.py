@@ -0,0 +1,358 @@
+import codecs
+import copy
+import json
+import logging
+import re
+from collections.abc import Mapping
+from datetime import datetime
+from functools import partial
+
+logger = logging.getLogger(__name__)
+
+try:  # optional: several times faster than the json module on large collections
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Subjects offered by the profile editors and the teacher search; documents store them lowercased.
+SUBJECTS = ["Math", "Physics", "Chemistry", "Biology", "English", "Computer Science", "History", "Economics"]
+
+
+class ValidationError(ValueError):
+    """A document from the API is missing a required field or has a field of the wrong type."""
+
+
+def _text(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise ValidationError(f"expected a string, got {type(value).__name__}")
+
+
+def _number(value):
+    if isinstance(value, bool):
+        raise ValidationError("expected a number, got bool")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValidationError(f"expected a number, got {value!r:.40}") from None
+
+
+def _texts(value):
+    if not isinstance(value, (list, tuple)):
+        raise ValidationError(f"expected a list, got {type(value).__name__}")
+    return tuple(_text(item) for item in value if item is not None)
+
+
+def _timestamp(value):
+    if isinstance(value, datetime):
+        return value
+    if not isinstance(value, str):
+        raise ValidationError(f"expected an ISO 8601 timestamp, got {type(value).__name__}")
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValidationError(f"expected an ISO 8601 timestamp, got {value!r:.40}") from None
+
+
+def _objects(value):
+    if not isinstance(value, (list, tuple)):
+        raise ValidationError(f"expected a list, got {type(value).__name__}")
+    return tuple(dict(item) for item in value if isinstance(item, Mapping))
+
+
+def _intervals(value):
+    """Availability slots; malformed slots are dropped rather than failing the whole document."""
+    if not isinstance(value, (list, tuple)):
+        raise ValidationError(f"expected a list, got {type(value).__name__}")
+    slots = []
+    for item in value:
+        try:
+            slots.append(Interval.from_wire(item))
+        except ValidationError:
+            continue
+    return tuple(slots)
+
+
+_unconverted_reported = set()
+
+
+def _report_unconverted(model, key, error):
+    """Log a field kept as sent: a warning the first time per model and field, then at debug level."""
+    level = logging.DEBUG if (model, key) in _unconverted_reported else logging.WARNING
+    _unconverted_reported.add((model, key))
+    logger.log(level, "%s.%s: %s; keeping the value as sent.", model.__name__, key, error)
+
+
+class Record(Mapping):
+    """
+    Base for the typed, read-only documents the API returns.
+
+    Fields live in __slots__, and from_wire converts a decoded JSON object in one pass
+    over its keys. Unknown keys read through to the document as received, and so does a
+    field value that doesn't convert (legacy documents, e.g. a time-of-day start_time).
+
+    Records read like the dicts they replace (`doc.get("name")`, `doc["id"]`, `**doc`); a
+    field that is missing or null on the wire is simply absent. They can't be modified,
+    which lets the response cache and the per-rerun identity map hand out the same
+    instance to every reader instead of deep copies. To change one, take copy(): it
+    returns the document exactly as received, as a plain dict, so a read-modify-write
+    sends back every stored field as it was, with only the edited keys changed.
+
+    Subclasses declare FIELDS (name -> converter) and REQUIRED (field names). Only the
+    REQUIRED fields must be present and convert for a document to be accepted.
+    """
+
+    __slots__ = ("_wire",)
+    FIELDS = {}
+    REQUIRED = ()
+
+    @classmethod
+    def from_wire(cls, data):
+        """
+        Build a record from a decoded JSON object.
+
+        A field that can't be converted to its type keeps the value as sent, and is logged.
+
+        Raises:
+            ValidationError: If `data` isn't an object, or a required field is missing or
+                can't be converted.
+        """
+        if isinstance(data, cls):
+            return data
+        if not isinstance(data, Mapping):
+            raise ValidationError(f"{cls.__name__}: expected an object, got {type(data).__name__}")
+        record = object.__new__(cls)
+        for name in cls.FIELDS:
+            object.__setattr__(record, name, None)
+        for key, value in data.items():
+            convert = cls.FIELDS.get(key)
+            if convert is not None and value is not None:
+                try:
+                    value = convert(value)
+                except ValidationError as e:
+                    if key in cls.REQUIRED:
+                        raise ValidationError(f"{cls.__name__}.{key}: {e}") from None
+                    _report_unconverted(cls, key, e)
+                object.__setattr__(record, key, value)
+        object.__setattr__(record, "_wire", data if type(data) is dict else dict(data))
+        for name in cls.REQUIRED:
+            if getattr(record, name) is None:
+                raise ValidationError(f"{cls.__name__}: missing required field {name!r}")
+        return record
+
+    def to_wire(self):
+        """The document as received from the API, as a JSON-ready dict of its own."""
+        return copy.deepcopy(self._wire)
+
+    def copy(self):
+        """An editable copy of the document as received (see to_wire)."""
+        return self.to_wire()
+
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            value = getattr(self, key)
+            if value is None:
+                raise KeyError(key)
+            return value
+        return self._wire[key]
+
+    def __iter__(self):
+        for name in self.FIELDS:
+            if getattr(self, name) is not None:
+                yield name
+        for key in self._wire:
+            if key not in self.FIELDS:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only; edit a copy()")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only; edit a copy()")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return type(self).from_wire, (self._wire,)
+
+
+class Interval(Record):
+    """An availability slot, {"start": ISO, "end": ISO} on the wire."""
+
+    __slots__ = ("start", "end")
+    FIELDS = {"start": _timestamp, "end": _timestamp}
+    REQUIRED = ("start", "end")
+
+    @classmethod
+    def from_wire(cls, data):
+        record = super().from_wire(data)
+        if record.end <= record.start:
+            raise ValidationError("Interval: end must be after start")
+        return record
+
+
+class User(Record):
+    __slots__ = ("id", "name", "username", "email", "phone", "about_section", "roles")
+    FIELDS = {"id": _text, "name": _text, "username": _text, "email": _text, "phone": _text,
+              "about_section": _text, "roles": _texts}
+    REQUIRED = ("id",)
+
+
+class Student(Record):
+    __slots__ = ("id", "name", "email", "phone", "about_section", "available", "subjects_interested_in_learning",
+                 "meetings", "rating")
+    FIELDS = {"id": _text, "name": _text, "email": _text, "phone": _text, "about_section": _text,
+              "available": _intervals, "subjects_interested_in_learning": _texts, "meetings": _texts,
+              "rating": _number}
+    REQUIRED = ("id",)
+
+
+class Teacher(Record):
+    __slots__ = ("id", "name", "email", "phone", "about_section", "available", "subjects_to_teach", "hourly_rate",
+                 "rating", "meetings")
+    FIELDS = {"id": _text, "name": _text, "email": _text, "phone": _text, "about_section": _text,
+              "available": _intervals, "subjects_to_teach": _texts, "hourly_rate": _number, "rating": _number,
+              "meetings": _texts}
+    REQUIRED = ("id",)
+
+
+class Meeting(Record):
+    __slots__ = ("id", "status", "subject", "topic", "location", "start_time", "finish_time", "scheduled_time",
+                 "people", "teacher_name", "student_name", "attached_files")
+    FIELDS = {"id": _text, "status": _text, "subject": _text, "topic": _text, "location": _text,
+              "start_time": _timestamp, "finish_time": _timestamp, "scheduled_time": _timestamp,
+              "people": _objects, "teacher_name": _text, "student_name": _text, "attached_files": _objects}
+    REQUIRED = ("id",)
+
+
+# GET responses decoded into records, by path (query string and trailing slash removed).
+# A path that matches none of these is returned as plain JSON.
+MODELS_BY_PATH = [
+    (re.compile(r"^/users/id/[^/]+$"), User),
+    (re.compile(r"^/students(?:/[^/]+)?$"), Student),
+    (re.compile(r"^/teachers(?:/[^/]+)?$"), Teacher),
+    (re.compile(r"^/teachers/[^/]+/busy$"), Interval),
+    (re.compile(r"^/meetings/user/[^/]+$"), Meeting),
+    (re.compile(r"^/meetings(?:/(?!bulk$|stream$)[^/]+)?$"), Meeting),
+]
+
+
+def model_for(path):
+    """The Record class GET responses from `path` decode into, or None."""
+    for pattern, model in MODELS_BY_PATH:
+        if pattern.match(path):
+            return model
+    return None
+
+
+def loads(body):
+    """Parse a JSON response body, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def to_records(data, model):
+    """
+    Convert a decoded document, or a list of them, into `model` records.
+
+    Documents that fail validation are logged and left out of a list; a single one comes
+    back as None, as a missing document would.
+    """
+    if isinstance(data, list):
+        return [record for record in map(partial(_list_item, model), data) if record is not None]
+    if data is None:
+        return None
+    try:
+        return model.from_wire(data)
+    except ValidationError as e:
+        logger.warning("Invalid %s: %s", model.__name__, e)
+        return None
+
+
+def _list_item(model, item):
+    try:
+        return model.from_wire(item)
+    except ValidationError as e:
+        logger.warning("Skipping invalid %s: %s", model.__name__, e)
+        return None
+
+
+_SPACE = re.compile(r"[ \t\r\n]*")
+_AFTER_ITEM = frozenset(" \t\r\n,]")
+_scan = json.JSONDecoder().raw_decode
+
+
+def iter_array(chunks, model=None):
+    """
+    Parse a JSON array from an iterable of byte chunks, yielding each element as soon as
+    the chunks holding it have arrived.
+
+    Only the unparsed tail of the body (at most one chunk plus the element being read) is
+    held, never the whole body or the whole decoded list. Elements are read with the json
+    module's C scanner; orjson has no incremental mode, so it isn't used here.
+
+    Args:
+        chunks (iterable): bytes of UTF-8 JSON, split anywhere.
+        model (type): Record class to convert elements into; invalid ones are logged and
+            skipped, as in to_records.
+
+    Raises:
+        ValueError: If the body isn't a JSON array, is malformed (json.JSONDecodeError)
+            or ends before the array is closed.
+    """
+    decode = codecs.getincrementaldecoder("utf-8")().decode
+    chunks = iter(chunks)
+    buffer, pos = "", 0
+    opened = after_item = after_comma = False
+    while True:
+        pos = _SPACE.match(buffer, pos).end()
+        if pos < len(buffer):
+            char = buffer[pos]
+            if not opened:
+                if char != "[":
+                    raise ValueError(f"expected a JSON array, got {char!r}")
+                opened, pos = True, pos + 1
+                continue
+            if char == "]" and not after_comma:
+                return
+            if after_item:
+                if char != ",":
+                    raise json.JSONDecodeError("expected ',' or ']'", buffer, pos)
+                after_item, after_comma, pos = False, True, pos + 1
+                continue
+            try:
+                item, end = _scan(buffer, pos)
+            except json.JSONDecodeError:
+                end = None  # incomplete, or malformed: told apart once the body has ended
+            # A complete element is followed by whitespace, "," or "]"; anything else (or the
+            # end of the buffer) may be a number cut short by the chunking, as in "-2500." + "5".
+            if end is not None and end < len(buffer) and buffer[end] in _AFTER_ITEM:
+                pos, after_item, after_comma = end, True, False
+                if model is None:
+                    yield item
+                else:
+                    record = _list_item(model, item)
+                    if record is not None:
+                        yield record
+                continue
+        chunk = next(chunks, None)
+        if chunk is None:
+            tail = buffer[pos:] + decode(b"", final=True)
+            if tail.strip():
+                _scan(tail)  # raises the parse error of a malformed element
+            raise ValueError("JSON array ended before it was closed")
+        buffer, pos = buffer[pos:] + decode(chunk), 0
@@ -0,0 +1,176 @@
+from collections.abc import Mapping
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from response_cache import normalize_path, write_affects
+from server_requests import (PageStream, fetch_data, prefetch_page, get_user_data, get_my_meetings,
+                             fetch_user_meetings, add_write_listener, logger)
+
+_MISSING = object()
+
+
+def begin_rerun():
+    """
+    Start a fresh identity map for this session. Called at the top of every full-script
+    rerun (website.main) and every fragment-only rerun (fragments.dashboard_fragment), so
+    documents are loaded at most once per rerun but never reused across reruns.
+    """
+    st.session_state["identity_map"] = {}
+
+
+def is_fragment_rerun():
+    """True while Streamlit is re-running only fragments, i.e. website.main didn't run."""
+    ctx = get_script_run_ctx()
+    return bool(ctx is not None and ctx.fragment_ids_this_run)
+
+
+def _identity_map():
+    return st.session_state.setdefault("identity_map", {})
+
+
+def _count(kind):
+    stats = st.session_state.setdefault("identity_map_stats", {"loads": 0, "hits": 0})
+    stats[kind] += 1
+
+
+def _load_once(key, load):
+    """Return the identity-mapped value for `key`, calling load() only the first time this rerun."""
+    identity_map = _identity_map()
+    value = identity_map.get(key, _MISSING)
+    if value is _MISSING:
+        value = identity_map[key] = load()
+        _count("loads")
+    else:
+        _count("hits")
+    return value
+
+
+def _forget_written(method, endpoint, data):
+    """Write listener: drop every identity-mapped entry the write made stale."""
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return  # written from a thread without a session; nothing of ours to invalidate
+    affected = write_affects(endpoint)
+    identity_map = _identity_map()
+    for key in [key for key in identity_map if affected(key[0])]:
+        del identity_map[key]
+
+
+add_write_listener(_forget_written)
+
+
+class DocumentRepo:
+    """
+    Per-rerun identity map over one backend collection, e.g. /teachers/{id}.
+
+    get() returns the same document object for every caller within a rerun and makes
+    at most one fetch_data call for it (the response cache still applies underneath).
+    Writes made through send_data evict the affected documents straight away.
+    """
+
+    collection = None
+
+    def path(self, doc_id):
+        return f"{self.collection}/{doc_id}"
+
+    def _fetch(self, doc_id, allow_missing):
+        data = fetch_data(self.path(doc_id), allow_missing=allow_missing)
+        return data if isinstance(data, Mapping) else None
+
+    def get(self, doc_id, allow_missing=False):
+        """
+        Args:
+            doc_id (str): Document id.
+            allow_missing (bool): Treat a 404 as "no such document" without showing an error.
+
+        Returns:
+            Record or None: The document (see models), or None if it doesn't exist or couldn't be loaded.
+        """
+        if not doc_id:
+            return None
+        return _load_once((self.path(doc_id), None), lambda: self._fetch(doc_id, allow_missing))
+
+    def _remember(self, doc):
+        """Add a document that arrived some other way (e.g. in a page) unless it's already mapped."""
+        if isinstance(doc, Mapping) and doc.get("id"):
+            _identity_map().setdefault((self.path(doc["id"]), None), doc)
+
+
+class UserRepo(DocumentRepo):
+    """Login accounts (/users/id/{id}; written through /users/{id})."""
+
+    collection = "/users"
+
+    def path(self, doc_id):
+        return f"/users/id/{doc_id}"
+
+    def _fetch(self, doc_id, allow_missing):
+        data = get_user_data(doc_id)
+        return data if isinstance(data, Mapping) else None
+
+
+class StudentRepo(DocumentRepo):
+    collection = "/students"
+
+
+class TeacherRepo(DocumentRepo):
+    collection = "/teachers"
+
+    def stream(self, page, page_size):
+        """
+        One page of the teacher listing, to render as it arrives: a PageStream to iterate (its
+        has_more is set once iteration ends). Each teacher is mapped as it is read, so a later
+        get() of the same teacher doesn't fetch it again.
+        """
+        return PageStream(f"{self.collection}/", page, page_size, on_record=self._remember)
+
+    def busy(self, teacher_id, since):
+        """
+        The teacher's booked time from `since` (a datetime) on, from /teachers/{id}/busy:
+        Interval records only, so a student never sees whose meetings they are. None if
+        the backend doesn't have the endpoint (see meeting_conflicts.teacher_schedule).
+        """
+        path = f"{self.path(teacher_id)}/busy"
+        return _load_once((normalize_path(path), ("since", since.isoformat())),
+                          lambda: fetch_data(path, params={"start": since.isoformat()}, allow_missing=True))
+
+    def prefetch(self, page, page_size):
+        """Warm the response cache for a page the user is likely to open next."""
+        prefetch_page(f"{self.collection}/", page, page_size)
+
+
+class MeetingRepo:
+    """A user's meetings, optionally filtered by status, loaded once per rerun."""
+
+    def for_user(self, user_id, status=None):
+        return _load_once((normalize_path(f"/meetings/user/{user_id}"), ("status", status)),
+                          lambda: get_my_meetings(user_id, status=status))
+
+    def since(self, user_id, start):
+        """The user's meetings starting at or after `start` (a datetime), in any status."""
+        return _load_once((normalize_path(f"/meetings/user/{user_id}"), ("since", start.isoformat())),
+                          lambda: fetch_user_meetings(user_id, start=start))
+
+
+user_repo = UserRepo()
+student_repo = StudentRepo()
+teacher_repo = TeacherRepo()
+meeting_repo = MeetingRepo()
+
+PROFILE_REPOS = {"Student": student_repo, "Teacher": teacher_repo}
+
+
+def find_profile(profile_type, user_id=None):
+    """
+    Return the Student or Teacher profile of `user_id` (default: the logged-in user),
+    or None if they don't have one. Replaces check_existing_profile for views.
+    """
+    repo = PROFILE_REPOS.get(profile_type)
+    if repo is None:
+        raise ValueError("Invalid profile type specified")
+    user_id = user_id or st.session_state.get("user_id")
+    if user_id is None:
+        logger.error("Profile lookup without a user id.")
+        st.error("User ID not set in session state.")
+        return None
+    return repo.get(user_id, allow_missing=True)
@@ -0,0 +1,147 @@
+import functools
+import json
+import logging
+import random
+import re
+from collections.abc import Mapping
+
+from config import env
+
+# Keys whose values never reach the logs, matched case-insensitively anywhere in a payload;
+# LOG_REDACT_FIELDS adds more (comma-separated).
+REDACTED_FIELDS = {
+    "password", "new_password", "old_password", "token", "access_token", "refresh_token",
+    "authorization", "secret", "api_key",
+}
+REDACTED = "***"
+
+
+@functools.lru_cache(maxsize=None)
+def _limits():
+    """
+    (redacted field names, pattern masking them inside text, LOG_MAX_CHARS, LOG_MAX_ITEMS),
+    read from the environment the first time something is rendered.
+
+    LOG_MAX_CHARS caps one rendered payload or body; LOG_MAX_ITEMS caps the list items /
+    dict keys rendered per container before the rest is elided.
+    """
+    fields = REDACTED_FIELDS | {f.strip().lower() for f in env("LOG_REDACT_FIELDS", "").split(",") if f.strip()}
+    secret_in_text = re.compile(
+        r'("?(?:' + "|".join(sorted(map(re.escape, fields))) + r')"?\s*[:=]\s*)("[^"]*"|[^\s,&}]+)',
+        re.IGNORECASE,
+    )
+    return fields, secret_in_text, int(env("LOG_MAX_CHARS", "512")), int(env("LOG_MAX_ITEMS", "20"))
+
+
+def _scrub(value):
+    fields, secret_in_text, _, max_items = _limits()
+    if isinstance(value, Mapping):  # dicts and models.Record documents
+        items = list(value.items())
+        scrubbed = {
+            key: REDACTED if str(key).lower() in fields else _scrub(item)
+            for key, item in items[:max_items]
+        }
+        if len(items) > max_items:
+            scrubbed["…"] = f"{len(items) - max_items} more keys"
+        return scrubbed
+    if isinstance(value, (list, tuple)):
+        scrubbed = [_scrub(item) for item in value[:max_items]]
+        if len(value) > max_items:
+            scrubbed.append(f"… {len(value) - max_items} more items")
+        return scrubbed
+    if isinstance(value, str):
+        return secret_in_text.sub(lambda m: m.group(1) + REDACTED, value)
+    return value
+
+
+def _clip(text, limit):
+    return text if len(text) <= limit else f"{text[:limit]}… ({len(text)} chars)"
+
+
+class Redacted:
+    """
+    Log argument that renders `value` with secrets masked and its size capped.
+
+    Rendering happens in __str__, i.e. only if a handler actually emits the record, so
+    `logger.debug("payload %s", Redacted(data))` costs nothing when DEBUG is off.
+    Strings (e.g. response.text) are masked by pattern and clipped the same way.
+    """
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value, limit=None):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self):
+        limit = self.limit or _limits()[2]
+        scrubbed = _scrub(self.value)
+        if isinstance(scrubbed, str):
+            return _clip(scrubbed, limit)
+        try:
+            text = json.dumps(scrubbed, default=str, ensure_ascii=False)
+        except (TypeError, ValueError):
+            text = repr(scrubbed)
+        return _clip(text, limit)
+
+    __repr__ = __str__
+
+
+class SuccessSampler:
+    """
+    Decides which routine success lines are logged; failures are always logged by callers.
+
+    Args:
+        rate (float): Fraction of successes to log (1.0 = all, 0 = none); defaults to
+            LOG_SUCCESS_SAMPLE_RATE (0.1), read on first use.
+    """
+
+    def __init__(self, rate=None):
+        self.rate = None if rate is None else max(0.0, min(1.0, rate))
+
+    def __call__(self):
+        if self.rate is None:
+            self.rate = max(0.0, min(1.0, float(env("LOG_SUCCESS_SAMPLE_RATE", "0.1"))))
+        return self.rate >= 1.0 or (self.rate > 0.0 and random.random() < self.rate)
+
+
+sample_success = SuccessSampler()
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line. Fields passed as `extra={"fields": {...}}` are merged
+    into the object so log pipelines can filter on them without parsing messages.
+    """
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if isinstance(fields, dict):
+            entry.update(fields)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def configure_logging():
+    """
+    Configure the root logger from LOG_LEVEL (default INFO) and LOG_FORMAT ("text" or "json").
+
+    Does nothing if the root logger already has handlers (e.g. configured by the host).
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    handler = logging.StreamHandler()
+    if env("LOG_FORMAT", "text").lower() == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+    root.addHandler(handler)
+    root.setLevel(env("LOG_LEVEL", "INFO").upper())
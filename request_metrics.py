@@ -0,0 +1,258 @@
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Path segments that are part of the API shape; anything else is treated as an id.
+_LITERAL_SEGMENTS = {"users", "students", "teachers", "meetings", "id", "user", "login", "bulk", "stream"}
+_LABEL_ESCAPES = re.compile(r'["\\\n]')
+
+
+def endpoint_template(endpoint):
+    """
+    Collapse ids in a path so metrics group by route, e.g.
+    "/teachers/676823f1e3603040e08723a3" → "/teachers/{id}".
+    """
+    path = endpoint.split("?", 1)[0].rstrip("/") or "/"
+    return "/".join(part if not part or part in _LITERAL_SEGMENTS else "{id}" for part in path.split("/"))
+
+
+def _label(value):
+    return _LABEL_ESCAPES.sub(lambda m: "\\n" if m.group() == "\n" else "\\" + m.group(), str(value))
+
+
+class _Series:
+    __slots__ = ("bucket_counts", "count", "latency_sum", "response_bytes", "decode_seconds", "decode_count",
+                 "statuses", "errors", "bodies")
+
+    def __init__(self):
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.latency_sum = 0.0
+        self.response_bytes = 0
+        self.decode_seconds = 0.0
+        self.decode_count = 0
+        self.statuses = {}
+        self.errors = {}
+        # direction ("request"/"response") -> [body bytes, bytes on the wire, codec CPU seconds, compressed bodies]
+        self.bodies = {}
+
+    def compression_ratio(self, direction):
+        """Body bytes per byte on the wire (1.0 when nothing was compressed), or None without bodies."""
+        size, wire, _, _ = self.bodies.get(direction, (0, 0, 0.0, 0))
+        return round(size / wire, 2) if wire else None
+
+    def quantile(self, q):
+        """Approximate quantile from the histogram (upper bound of the bucket it falls in)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for bound, cumulative in zip(LATENCY_BUCKETS, self.bucket_counts):
+            if cumulative >= rank:
+                return bound
+        return float("inf")
+
+
+class RequestMetrics:
+    """
+    Thread-safe per-endpoint request metrics: latency histogram, status counts,
+    response bytes, JSON decode time, compression ratio and CPU, and error counts,
+    labelled by method and endpoint template.
+    """
+
+    def __init__(self, prefix="tutor_client"):
+        self.prefix = prefix
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _get(self, method, endpoint):
+        key = (method.upper(), endpoint_template(endpoint))
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series()
+        return series
+
+    def observe(self, method, endpoint, status, seconds, response_bytes=0):
+        """
+        Record one round trip.
+
+        Args:
+            status: HTTP status code, or an error kind such as "network_error".
+            seconds (float): Wall-clock time until the response body was received.
+            response_bytes (int): Size of the response body.
+        """
+        with self._lock:
+            series = self._get(method, endpoint)
+            series.count += 1
+            series.latency_sum += seconds
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    series.bucket_counts[i] += 1
+            series.response_bytes += response_bytes
+            series.statuses[str(status)] = series.statuses.get(str(status), 0) + 1
+            if not isinstance(status, int):
+                series.errors[status] = series.errors.get(status, 0) + 1
+            elif status >= 400:
+                kind = "server_error" if status >= 500 else "client_error"
+                series.errors[kind] = series.errors.get(kind, 0) + 1
+
+    def observe_decode(self, method, endpoint, seconds):
+        """Record the time spent decoding one JSON response body."""
+        with self._lock:
+            series = self._get(method, endpoint)
+            series.decode_seconds += seconds
+            series.decode_count += 1
+
+    def observe_body(self, method, endpoint, direction, size, wire_bytes, cpu_seconds=0.0):
+        """
+        Record one request or response body before and after compression.
+
+        Args:
+            direction (str): "request" or "response".
+            size (int): Bytes of the body itself.
+            wire_bytes (int): Bytes sent or received for it, after Content-Encoding.
+            cpu_seconds (float): CPU time spent compressing it (requests) or reading and
+                decompressing it (responses); 0 for an uncompressed body.
+        """
+        with self._lock:
+            totals = self._get(method, endpoint).bodies.setdefault(direction, [0, 0, 0.0, 0])
+            totals[0] += size
+            totals[1] += wire_bytes
+            totals[2] += cpu_seconds
+            totals[3] += wire_bytes != size
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self):
+        """
+        Return one summary row per (method, endpoint template), for display.
+
+        Returns:
+            list: Dicts with count, error and latency/size/decode summaries.
+        """
+        with self._lock:
+            rows = []
+            for (method, endpoint), series in sorted(self._series.items(), key=lambda item: item[0][1]):
+                rows.append({
+                    "method": method,
+                    "endpoint": endpoint,
+                    "requests": series.count,
+                    "errors": sum(series.errors.values()),
+                    "avg_ms": round(1000 * series.latency_sum / series.count, 1) if series.count else 0.0,
+                    "p50_ms": 1000 * series.quantile(0.5),
+                    "p95_ms": 1000 * series.quantile(0.95),
+                    "kb_received": round(series.response_bytes / 1024, 1),
+                    "decode_ms": round(1000 * series.decode_seconds, 1),
+                    "request_ratio": series.compression_ratio("request"),
+                    "response_ratio": series.compression_ratio("response"),
+                    "codec_cpu_ms": round(1000 * sum(totals[2] for totals in series.bodies.values()), 1),
+                    "statuses": dict(series.statuses),
+                })
+            return rows
+
+    def render_prometheus(self):
+        """Render all series in the Prometheus text exposition format."""
+        p = self.prefix
+        lines = [
+            f"# HELP {p}_request_duration_seconds Backend request latency.",
+            f"# TYPE {p}_request_duration_seconds histogram",
+        ]
+        counters = {
+            "requests_total": ("Backend requests by status.", []),
+            "request_errors_total": ("Failed backend requests by kind.", []),
+            "response_bytes_total": ("Response body bytes received.", []),
+            "json_decode_seconds_total": ("Time spent decoding JSON responses.", []),
+            "json_decodes_total": ("JSON response bodies decoded.", []),
+            "body_bytes_total": ("Request and response body bytes, before compression.", []),
+            "body_wire_bytes_total": ("Request and response body bytes on the wire, after Content-Encoding.", []),
+            "body_codec_cpu_seconds_total": ("CPU time spent compressing requests and decompressing responses.", []),
+            "compressed_bodies_total": ("Request and response bodies sent or received compressed.", []),
+        }
+        with self._lock:
+            for (method, endpoint), series in sorted(self._series.items()):
+                labels = f'method="{_label(method)}",endpoint="{_label(endpoint)}"'
+                for bound, cumulative in zip(LATENCY_BUCKETS, series.bucket_counts):
+                    lines.append(f'{p}_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{p}_request_duration_seconds_bucket{{{labels},le="+Inf"}} {series.count}')
+                lines.append(f"{p}_request_duration_seconds_sum{{{labels}}} {series.latency_sum:.6f}")
+                lines.append(f"{p}_request_duration_seconds_count{{{labels}}} {series.count}")
+                for status, count in sorted(series.statuses.items()):
+                    counters["requests_total"][1].append(f'{{{labels},status="{_label(status)}"}} {count}')
+                for kind, count in sorted(series.errors.items()):
+                    counters["request_errors_total"][1].append(f'{{{labels},kind="{_label(kind)}"}} {count}')
+                counters["response_bytes_total"][1].append(f"{{{labels}}} {series.response_bytes}")
+                counters["json_decode_seconds_total"][1].append(f"{{{labels}}} {series.decode_seconds:.6f}")
+                counters["json_decodes_total"][1].append(f"{{{labels}}} {series.decode_count}")
+                for direction, (size, wire, cpu, compressed) in sorted(series.bodies.items()):
+                    body_labels = f'{labels},direction="{direction}"'
+                    counters["body_bytes_total"][1].append(f"{{{body_labels}}} {size}")
+                    counters["body_wire_bytes_total"][1].append(f"{{{body_labels}}} {wire}")
+                    counters["body_codec_cpu_seconds_total"][1].append(f"{{{body_labels}}} {cpu:.6f}")
+                    counters["compressed_bodies_total"][1].append(f"{{{body_labels}}} {compressed}")
+        for name, (help_text, samples) in counters.items():
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} counter")
+            lines.extend(f"{p}_{name}{sample}" for sample in samples)
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """Atomically write the Prometheus text to `path` (e.g. for node_exporter's textfile collector)."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.metrics.render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(metrics, port, host="127.0.0.1"):
+    """
+    Serve `metrics` at http://host:port/metrics from a daemon thread. Only local scrapers
+    can reach it by default; the paths and error counts aren't meant for everyone.
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    server.metrics = metrics
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics-server").start()
+    return server
+
+
+class TextfileExporter:
+    """Rewrites a Prometheus text file at most once every `interval` seconds."""
+
+    def __init__(self, metrics, path, interval=10.0):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+
+    def maybe_write(self):
+        now = time.monotonic()
+        if now - self._last_write < self.interval or not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._last_write = now
+            self.metrics.write_textfile(self.path)
+        finally:
+            self._lock.release()
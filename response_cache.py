@@ -0,0 +1,205 @@
+import copy
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# Writes whose effects are visible under a different path than the one written to.
+# Each pattern maps a written path to extra paths that must be invalidated with it.
+RELATED_PATHS = [
+    (re.compile(r"^/users/([^/]+)$"), "/users/id/{0}"),
+    # Per-user meeting lists (/meetings/user/{id}) are derived from every meeting document.
+    (re.compile(r"^/meetings(?:/.*)?$"), "/meetings"),
+]
+
+
+def normalize_path(endpoint):
+    """Strip the query string and trailing slash so "/teachers/" and "/teachers" share entries."""
+    path = endpoint.split("?", 1)[0]
+    return path.rstrip("/") or "/"
+
+
+def write_affects(endpoint):
+    """
+    Return a predicate telling whether a cached path is stale after a write to `endpoint`:
+    the resource itself, anything below it, its parent collections and RELATED_PATHS.
+    """
+    path = normalize_path(endpoint)
+    roots = [path]
+    for pattern, template in RELATED_PATHS:
+        match = pattern.match(path)
+        if match:
+            roots.append(template.format(*match.groups()))
+
+    def affected(cached_path):
+        for root in roots:
+            if cached_path == root or cached_path.startswith(root + "/") or root.startswith(cached_path + "/"):
+                return True
+        return False
+
+    return affected
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of parsed GET responses with per-endpoint TTLs.
+
+    Entries are keyed by (normalized path, params, auth identity). Values are deep-copied
+    in and out so a caller can't change what the next one gets; read-only records
+    (models.Record) copy as themselves, so for decoded documents this only copies the lists.
+
+    Entries stored with HTTP validators (ETag / Last-Modified) are kept past their TTL
+    so the next request can be conditional; a 304 then revives the cached body.
+    """
+
+    def __init__(self, max_entries=512, default_ttl=30.0, endpoint_ttls=None, clock=time.monotonic):
+        """
+        Args:
+            max_entries (int): LRU bound; the least recently used entry is evicted past it.
+            default_ttl (float): Seconds an entry stays fresh when no endpoint TTL matches.
+            endpoint_ttls (dict): Path prefix → TTL in seconds; the longest matching prefix wins.
+            clock (callable): Monotonic time source, injectable for tests.
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.endpoint_ttls = dict(endpoint_ttls or {})
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.revalidations = 0
+        self.bytes_saved = 0
+        self.parse_seconds_saved = 0.0
+
+    @staticmethod
+    def make_key(endpoint, params=None, identity=""):
+        """Build a hashable cache key for a GET request."""
+        param_items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+        return normalize_path(endpoint), param_items, identity
+
+    def ttl_for(self, path):
+        """Return the TTL for a normalized path using the longest matching prefix."""
+        best_prefix, ttl = "", self.default_ttl
+        for prefix, prefix_ttl in self.endpoint_ttls.items():
+            prefix = normalize_path(prefix)
+            if (path == prefix or path.startswith(prefix + "/")) and len(prefix) > len(best_prefix):
+                best_prefix, ttl = prefix, prefix_ttl
+        return ttl
+
+    def get(self, key):
+        """
+        Look up a fresh entry.
+
+        Returns:
+            tuple: (True, value) on a hit, (False, None) on a miss or expired entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self._clock():
+                if entry is not None and not entry[2].get("validators"):
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, copy.deepcopy(entry[1])
+
+    def contains(self, key):
+        """Return True if a fresh entry exists, without counting a hit or miss or touching LRU order."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[0] > self._clock()
+
+    def put(self, key, value, ttl=None, validators=None, size=0, parse_seconds=0.0):
+        """
+        Store a value, evicting least recently used entries past max_entries.
+
+        Args:
+            key (tuple): Key from make_key().
+            value: Parsed response body.
+            ttl (float): Freshness in seconds; defaults to the endpoint TTL.
+            validators (dict): Request headers that revalidate this body, e.g. {"If-None-Match": etag}.
+            size (int): Response body size in bytes, reported as saved on each 304.
+            parse_seconds (float): Time spent decoding the body, reported as saved on each 304.
+        """
+        if ttl is None:
+            ttl = self.ttl_for(key[0])
+        if ttl <= 0 and not validators:
+            return
+        meta = {"validators": validators or {}, "size": size, "parse_seconds": parse_seconds}
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, copy.deepcopy(value), meta)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def validators(self, key):
+        """Return the conditional-request headers stored for `key`, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return dict(entry[2]["validators"]) if entry is not None and entry[2]["validators"] else None
+
+    def revalidated(self, key, ttl=None):
+        """
+        Record a 304 Not Modified for `key`: extend its freshness and return the cached body.
+
+        Returns:
+            tuple: (True, value), or (False, None) if the entry was evicted meanwhile.
+        """
+        if ttl is None:
+            ttl = self.ttl_for(key[0])
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value, meta = entry
+            self._entries[key] = (self._clock() + ttl, value, meta)
+            self._entries.move_to_end(key)
+            self.revalidations += 1
+            self.bytes_saved += meta["size"]
+            self.parse_seconds_saved += meta["parse_seconds"]
+            return True, copy.deepcopy(value)
+
+    def invalidate(self, endpoint):
+        """
+        Evict every entry affected by a write to `endpoint`, for all identities.
+
+        That is the resource itself, anything below it, its parent collections
+        (a PUT to /teachers/{id} evicts /teachers/{id} and /teachers/) and the
+        paths listed in RELATED_PATHS.
+
+        Returns:
+            int: Number of entries evicted.
+        """
+        affected = write_affects(endpoint)
+        with self._lock:
+            stale = [key for key in self._entries if affected(key[0])]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss/eviction counters and the current size, for tuning TTLs and max_entries."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "revalidations": self.revalidations,
+                "bytes_saved": self.bytes_saved,
+                "parse_seconds_saved": self.parse_seconds_saved,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+            }
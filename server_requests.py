@@ -1,129 +1,1021 @@
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from datetime import datetime
+from collections.abc import Mapping
 from typing import Optional
+
 import streamlit as st
-import requests
-import logging
-from dotenv import load_dotenv
-import os
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from compression import compress, mark_request_compression_unsupported, request_encoding
+from config import base_url, env
+from response_cache import ResponseCache, normalize_path
+from request_metrics import RequestMetrics, TextfileExporter, start_metrics_server, endpoint_template
+from request_logging import Redacted, sample_success
+from models import Teacher, iter_array, loads, model_for, to_records
 
-# Load environment variables
-load_dotenv()
+# Nothing here reads settings, touches the network or calls st.* at import time: .env is
+# loaded on first use (config.env), requests/urllib3 load with the first HTTP call
+# (http_client), and logging is configured by website.main.
+logger = logging.getLogger(__name__)
 
-# Get BASE_URL from the .env file
-BASE_URL = os.getenv("BASE_URL")
+# Per-endpoint freshness (seconds) for cached GET responses; meeting status changes
+# the most often, profile documents the least.
+CACHE_TTLS = {
+    "/users": 60,
+    "/students": 30,
+    "/teachers": 30,
+    "/meetings": 5,
+}
 
-# Check if BASE_URL is loaded properly
-if not BASE_URL:
-    st.error("BASE_URL not found in the environment variables. Please configure it in your .env file.")
-    raise ValueError("BASE_URL is not set in the .env file.")
+# POSTs that don't create or change a resource and must not invalidate the cache.
+NON_MUTATING_ENDPOINTS = {"/users/login"}
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-logger = logging.getLogger(__name__)
+PROFILE_ENDPOINTS = {"Student": "/students", "Teacher": "/teachers"}
+
+MEETING_STATUS_FILTERS = ["All", "Pending", "Approved", "Canceled"]
+
+# Collections whose server ignored skip/limit; these are fetched once and sliced locally.
+_unpaged_endpoints = set()
+_prefetches = {}
+_prefetch_lock = threading.Lock()
+_executor = None
+_executor_lock = threading.Lock()
+_write_listeners = []
+_gather_executor = None
+_gather_local = threading.local()
+_call_count_lock = threading.Lock()
 
+# Per-endpoint latency/size/error metrics; exported via METRICS_PORT (/metrics) and/or METRICS_FILE
+request_metrics = RequestMetrics()
+_metrics_exporter = None
+_metrics_started = False
+
+_response_cache = None
+_cache_lock = threading.Lock()
+
+# Opt-in durable write-behind for PUTs (see write_queue()); these answers are worth retrying.
+WRITE_BEHIND_METHODS = {"PUT"}
+WRITE_BEHIND_RETRY_STATUSES = {408, 429}
+_write_queue = None
+
+# Meeting status changes for many meetings go out as one request; a backend without the
+# endpoint (404/405) is remembered and gets one PUT per meeting instead.
+BULK_MEETINGS_ENDPOINT = "/meetings/bulk"
+_bulk_unsupported = False
+
+# Marks the end of a parser for next(); None can't, JSON null decodes to it.
+_END = object()
+
+
+def negative_cache_ttl():
+    """
+    How long a 404 from a per-id lookup (e.g. "this user has no teacher profile") is trusted
+    (NEGATIVE_CACHE_TTL). Creating the profile invalidates the entry straight away, so this can be generous.
+    """
+    return float(env("NEGATIVE_CACHE_TTL", "300"))
 
-def handle_response(response, success_message=None):
+
+def meetings_page_size():
+    """Meetings requested per round trip when paging a user's history (MEETINGS_PAGE_SIZE)."""
+    return int(env("MEETINGS_PAGE_SIZE", "100"))
+
+
+def meetings_max_pages():
+    """Pages of a user's history fetched at most per listing (MEETINGS_MAX_PAGES)."""
+    return int(env("MEETINGS_MAX_PAGES", "5"))
+
+
+def _cache():
+    """The shared response cache, sized from RESPONSE_CACHE_MAX_ENTRIES / RESPONSE_CACHE_TTL on first use."""
+    global _response_cache
+    if _response_cache is None:
+        with _cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache(
+                    max_entries=int(env("RESPONSE_CACHE_MAX_ENTRIES", "512")),
+                    default_ttl=float(env("RESPONSE_CACHE_TTL", "30")),
+                    endpoint_ttls=CACHE_TTLS,
+                )
+    return _response_cache
+
+
+def _start_metrics_export():
+    """
+    Start the METRICS_PORT endpoint (bound to METRICS_HOST, default 127.0.0.1) / METRICS_FILE
+    exporter once, with the first request.
+    """
+    global _metrics_exporter, _metrics_started
+    with _executor_lock:
+        if _metrics_started:
+            return
+        _metrics_started = True
+    if env("METRICS_FILE"):
+        _metrics_exporter = TextfileExporter(request_metrics, env("METRICS_FILE"))
+    if env("METRICS_PORT"):
+        try:
+            start_metrics_server(request_metrics, int(env("METRICS_PORT")), env("METRICS_HOST", "127.0.0.1"))
+        except OSError as e:  # already bound by another Streamlit process
+            logger.warning("Metrics endpoint not started: %s", e)
+
+
+def handle_response(response, success_message=None, model=None):
+    """
+    Parse a response body, or show the API's error message.
+
+    Args:
+        model (type): Record class (see models) to decode a successful body into.
+    """
     try:
         if response.status_code in [200, 201]:
             if success_message:
                 st.success(success_message)
-            return response.json()  # Return the parsed response
+            data = loads(response.content)
+            return to_records(data, model) if model is not None else data
         else:
             # Handle error responses
             error_message = response.json().get("message", response.text)
-            logger.error(f"API Error: {response.status_code} - {response.text}")
+            logger.error("API Error: %s - %s", response.status_code, Redacted(response.text))
             st.error(f"Error: {error_message}")
             return None
     except Exception as e:
-        logger.exception(f"Failed to handle API response: {e}")
+        logger.exception("Failed to handle API response: %s", e)
         st.error("An unexpected error occurred while processing the server response.")
         return None
 
 
+def _count_backend_call():
+    """Count a round trip to the backend for this browser session (see backend_call_count)."""
+    with _call_count_lock:
+        st.session_state["backend_calls"] = st.session_state.get("backend_calls", 0) + 1
+
+
+def backend_call_count():
+    """Number of HTTP round trips made so far on behalf of the current session (cache hits excluded)."""
+    return st.session_state.get("backend_calls", 0)
+
+
+def _perform(method, endpoint, count=True, timeout=None, **kwargs):
+    """
+    Send one request to BASE_URL through the pooled session, timing it into request_metrics.
+
+    A `json` body is encoded here and, past REQUEST_COMPRESSION_MIN_BYTES, compressed as
+    REQUEST_COMPRESSION says (see compression.request_encoding). A backend that refuses
+    compressed bodies (415) gets this one again uncompressed, and all later ones too.
+    Body sizes before and after compression, and the CPU time spent on it, go to
+    request_metrics.observe_body.
+
+    Raises:
+        ConfigError: If BASE_URL isn't configured.
+        requests.exceptions.RequestException: On network errors and timeouts.
+
+    Args:
+        count (bool): Count it towards the session's backend_call_count (False off the script thread).
+        timeout (tuple): (connect, read) timeout; defaults to default_timeout().
+        **kwargs: Passed on to requests.Session.request (headers, params, json, ...).
+
+    Returns:
+        requests.Response: The response, with its body already read; with stream=True a
+        200 is returned unread and the caller observes it once the body is in (see stream_data).
+    """
+    import requests
+    from http_client import get_session, default_timeout
+
+    url = f"{base_url()}{endpoint}"
+    _start_metrics_export()
+    if count:
+        _count_backend_call()
+    stream = kwargs.pop("stream", False)
+    encoding = None
+    if kwargs.get("json") is not None:
+        data = kwargs.pop("json")
+        body = json.dumps(data, allow_nan=False).encode()
+        size, cpu_seconds = len(body), 0.0
+        encoding = request_encoding(size)
+        if encoding:
+            cpu_started = time.thread_time()
+            body = compress(body, encoding)
+            cpu_seconds = time.thread_time() - cpu_started
+            kwargs["headers"] = {**kwargs.get("headers", {}), "Content-Encoding": encoding}
+        kwargs["data"] = body
+        kwargs["headers"] = {"Content-Type": "application/json", **kwargs.get("headers", {})}
+        request_metrics.observe_body(method, endpoint, "request", size, len(body), cpu_seconds)
+    started = time.perf_counter()
+    try:
+        # Always streamed, so reading (and decompressing) the body can be timed on its own.
+        response = get_session().request(method, url, timeout=timeout or default_timeout(), stream=True, **kwargs)
+        if not (stream and response.status_code == 200):
+            cpu_started = time.thread_time()
+            content = response.content
+            cpu_seconds = time.thread_time() - cpu_started
+    except requests.exceptions.RequestException as e:
+        kind = "timeout" if isinstance(e, requests.exceptions.Timeout) else "network_error"
+        seconds = time.perf_counter() - started
+        request_metrics.observe(method, endpoint, kind, seconds)
+        _log_request(logging.WARNING, method, endpoint, kind, seconds)
+        raise
+    else:
+        if stream and response.status_code == 200:
+            return response
+        seconds = time.perf_counter() - started
+        _observe(method, endpoint, response.status_code, seconds, len(content))
+        request_metrics.observe_body(method, endpoint, "response", len(content), response.raw.tell(),
+                                     cpu_seconds if response.headers.get("Content-Encoding") else 0.0)
+        if encoding and response.status_code == 415:
+            mark_request_compression_unsupported()
+            headers = {k: v for k, v in kwargs.pop("headers").items() if k != "Content-Encoding"}
+            kwargs.pop("data")
+            return _perform(method, endpoint, count=False, timeout=timeout, stream=stream, json=data,
+                            headers=headers, **kwargs)
+        return response
+    finally:
+        if _metrics_exporter is not None:
+            _metrics_exporter.maybe_write()
+
+
+def _observe(method, endpoint, status, seconds, size):
+    """Record a completed round trip in request_metrics and the request log."""
+    request_metrics.observe(method, endpoint, status, seconds, size)
+    if status >= 400:
+        _log_request(logging.WARNING, method, endpoint, status, seconds, size)
+    elif logger.isEnabledFor(logging.INFO) and sample_success():
+        _log_request(logging.INFO, method, endpoint, status, seconds, size)
+
+
+def _log_request(level, method, endpoint, status, seconds, size=0):
+    """
+    One structured line per round trip. Successes are sampled (LOG_SUCCESS_SAMPLE_RATE);
+    failures always reach the log. Ids are collapsed to the endpoint template.
+    """
+    route = endpoint_template(endpoint)
+    logger.log(level, "%s %s -> %s in %.1f ms (%d bytes)", method, route, status, 1000 * seconds, size,
+               extra={"fields": {"method": method, "endpoint": route, "status": status,
+                                 "duration_ms": round(1000 * seconds, 1), "bytes": size}})
+
+
+def _decode(method, endpoint, response):
+    """handle_response() with the JSON decode time recorded; returns (data, seconds)."""
+    started = time.perf_counter()
+    data = handle_response(response, model=model_for(normalize_path(endpoint)) if method == "GET" else None)
+    elapsed = time.perf_counter() - started
+    if response.status_code in (200, 201):
+        request_metrics.observe_decode(method, endpoint, elapsed)
+    return data, elapsed
+
+
+def _validators_from(response):
+    """Conditional-request headers that revalidate this response's body."""
+    validators = {}
+    if response.headers.get("ETag"):
+        validators["If-None-Match"] = response.headers["ETag"]
+    if response.headers.get("Last-Modified"):
+        validators["If-Modified-Since"] = response.headers["Last-Modified"]
+    return validators
+
+
 # API Interactions
-def fetch_data(endpoint, params=None):
-    """Fetch data from an endpoint with optional query parameters."""
+def fetch_data(endpoint, params=None, timeout=None, use_cache=True, allow_missing=False):
+    """
+    Fetch data from an endpoint with optional query parameters.
+
+    Requests go through the shared pooled session, so keep-alive connections to
+    BASE_URL are reused across reruns and idempotent calls are retried with backoff.
+    `timeout` is a (connect, read) tuple; defaults to HTTP_CONNECT_TIMEOUT / HTTP_READ_TIMEOUT.
+
+    Successful responses are kept in the response cache (see CACHE_TTLS) keyed by
+    endpoint, params and auth token; pass use_cache=False to force a round trip.
+
+    With allow_missing=True a 404 is an expected answer: it returns None without
+    showing an error and is negatively cached for NEGATIVE_CACHE_TTL seconds.
+
+    Once a cached entry expires, its ETag / Last-Modified are sent back as
+    If-None-Match / If-Modified-Since; a 304 reuses the cached body without
+    re-downloading or re-parsing it (see cache_stats() for the bytes and time saved).
+    """
     try:
-        headers = {"Authorization": f"Bearer {st.session_state.get('token', '')}"}
-        logger.info(f"Fetching data from endpoint: {endpoint}")
-        response = requests.get(f"{BASE_URL}{endpoint}", headers=headers, params=params)
-        return handle_response(response)
+        token = st.session_state.get('token', '')
+        cache_key = ResponseCache.make_key(endpoint, params, token)
+        if use_cache:
+            hit, cached = _cache().get(cache_key)
+            if hit:
+                logger.debug("Cache hit for endpoint: %s", endpoint)
+                return cached
+
+        headers = {"Authorization": f"Bearer {token}"}
+        if use_cache:
+            headers.update(_cache().validators(cache_key) or {})
+        response = _perform("GET", endpoint, headers=headers, params=params, timeout=timeout)
+        if use_cache and response.status_code == 304:
+            hit, cached = _cache().revalidated(cache_key)
+            if hit:
+                logger.debug("Not modified: %s", endpoint)
+                return cached
+            # Evicted between the request and the answer; ask again unconditionally.
+            return fetch_data(endpoint, params=params, timeout=timeout, use_cache=False)
+        if allow_missing and response.status_code == 404:
+            logger.debug("Endpoint %s not found.", endpoint)
+            if use_cache:
+                _cache().put(cache_key, None, ttl=negative_cache_ttl())
+            return None
+        data, parse_seconds = _decode("GET", endpoint, response)
+        if use_cache and response.status_code == 200 and data is not None:
+            _cache().put(cache_key, data, validators=_validators_from(response),
+                         size=len(response.content), parse_seconds=parse_seconds)
+        return data
     except Exception as e:
-        logger.exception(f"Exception occurred while fetching data from {endpoint}: {e}")
+        logger.exception("Exception occurred while fetching data from %s: %s", endpoint, e)
         st.error("An unexpected error occurred while fetching data.")
         return []
 
 
-def send_data(endpoint, data=None, method="POST"):
+def stream_data(endpoint, params=None, timeout=None, use_cache=True):
+    """
+    Iterate the records of a collection endpoint as its response body arrives.
+
+    The body is read in STREAM_CHUNK_BYTES pieces (chunked transfer or not) and parsed
+    incrementally (models.iter_array), so a caller can render the first records while the
+    rest download, and neither the raw body nor the decoded JSON of the whole collection
+    is ever held at once. Records are decoded as in fetch_data (see models.MODELS_BY_PATH).
+
+    Shares fetch_data's cache: a fresh entry is iterated without a request, and a body read
+    to the end is stored as a list for later fetch_data / stream_data calls. A caller that
+    stops early closes the connection and caches nothing; use_cache=False keeps no list.
+
+    Unlike fetch_data, failures raise rather than ending the iteration quietly, so a
+    caller can't mistake the records read before them for the whole collection.
+
+    Raises:
+        requests.exceptions.RequestException: If the request fails, the backend answers with
+            an error status or the body is cut off.
+        ValueError: If the body isn't a well-formed JSON array.
+    """
+    token = st.session_state.get('token', '')
+    cache_key = ResponseCache.make_key(endpoint, params, token)
+    if use_cache:
+        hit, cached = _cache().get(cache_key)
+        if hit:
+            logger.debug("Cache hit for endpoint: %s", endpoint)
+            yield from cached if isinstance(cached, list) else []
+            return
+
+    headers = {"Authorization": f"Bearer {token}"}
+    if use_cache:
+        headers.update(_cache().validators(cache_key) or {})
+    started = time.perf_counter()
+    response = _perform("GET", endpoint, headers=headers, params=params, timeout=timeout, stream=True)
+    if response.status_code != 200:
+        response.close()  # its body was read by _perform, so the connection goes back to the pool
+        if use_cache and response.status_code == 304:
+            hit, cached = _cache().revalidated(cache_key)
+            if hit:
+                logger.debug("Not modified: %s", endpoint)
+                yield from cached if isinstance(cached, list) else []
+            else:
+                yield from stream_data(endpoint, params=params, timeout=timeout, use_cache=False)
+            return
+        response.raise_for_status()
+        return
+
+    complete = False
+    try:
+        # [seconds, CPU seconds, body bytes] spent reading (and decompressing) the body,
+        # to tell the parse time apart
+        reading = [0.0, 0.0, 0]
+        records = [] if use_cache else None
+        body = _body_chunks(response, reading)
+        items = iter_array(body, model_for(normalize_path(endpoint)))
+        in_parser = 0.0
+        while True:
+            resumed = time.perf_counter()
+            record = next(items, _END)
+            in_parser += time.perf_counter() - resumed
+            if record is _END:
+                break
+            if records is not None:
+                records.append(record)
+            yield record
+        for _ in body:
+            pass  # whatever follows the closing bracket, so the connection can be reused
+        complete = True
+    finally:
+        # Response.close() would drop the connection, as requests can't tell the body was read.
+        response.raw.release_conn() if complete else response.close()
+
+    parse_seconds = in_parser - reading[0]
+    size = reading[2]
+    _observe("GET", endpoint, response.status_code, time.perf_counter() - started, size)
+    request_metrics.observe_body("GET", endpoint, "response", size, response.raw.tell(),
+                                 reading[1] if response.headers.get("Content-Encoding") else 0.0)
+    request_metrics.observe_decode("GET", endpoint, parse_seconds)
+    if records is not None:
+        _cache().put(cache_key, records, validators=_validators_from(response), size=size,
+                     parse_seconds=parse_seconds)
+
+
+def stream_chunk_bytes():
+    return int(env("STREAM_CHUNK_BYTES", "16384"))
+
+
+def _body_chunks(response, reading):
+    """
+    Yield a streamed response body (decompressed) as it arrives, adding the time and CPU
+    time spent reading it, and its size, to `reading`. read1 returns whatever has arrived
+    instead of waiting for a full chunk, as Response.iter_content would.
+    """
+    chunk_size = stream_chunk_bytes()
+    read = response.raw.read1 if hasattr(response.raw, "read1") else response.raw.read
+    while True:
+        started, cpu_started = time.perf_counter(), time.thread_time()
+        chunk = read(chunk_size, decode_content=True)
+        reading[0] += time.perf_counter() - started
+        reading[1] += time.thread_time() - cpu_started
+        reading[2] += len(chunk)
+        if not chunk:
+            return
+        yield chunk
+
+
+class PageStream:
+    """
+    One page of a collection, iterated as its records are parsed (see stream_data).
+
+    The streaming counterpart of fetch_page: iterating yields the page's records as they
+    arrive, so the first ones can be rendered before the response is complete; has_more
+    is known once iteration ends. A server that ignores skip/limit streams the whole
+    collection, which is sliced as it goes and cached for the following pages.
+
+    Args:
+        endpoint (str): Collection endpoint, e.g. "/teachers/".
+        page (int): Zero-based page number.
+        page_size (int): Records per page.
+        params (dict): Extra query parameters (filters) sent with every page.
+        on_record (callable): Called with each record of the page as it is yielded.
+    """
+
+    def __init__(self, endpoint, page, page_size, params=None, on_record=None):
+        self.endpoint = endpoint
+        self.page = page
+        self.page_size = page_size
+        self.params = params
+        self.on_record = on_record
+        self.has_more = False
+
+    def _emit(self, record):
+        if self.on_record is not None:
+            self.on_record(record)
+        return record
+
+    def __iter__(self):
+        path = normalize_path(self.endpoint)
+        paging_requested = path not in _unpaged_endpoints
+        if paging_requested and self.page > 0:
+            # Only a first page can be shown as it arrives before knowing whether the server
+            # honours skip/limit; later pages are small when it does.
+            records, self.has_more = fetch_page(self.endpoint, self.page, self.page_size, self.params)
+            yield from map(self._emit, records)
+            return
+        with _prefetch_lock:
+            pending = _prefetches.pop((path, self.page, self.page_size), None)
+        if pending is not None:
+            pending.result()
+
+        start = 0 if paging_requested else self.page * self.page_size
+        # Kept in case the server sends the whole collection, for the following pages
+        received = [] if paging_requested else None
+        seen = 0
+        for record in stream_data(self.endpoint, params=_page_params(self.endpoint, self.page, self.page_size,
+                                                                     self.params)):
+            if start <= seen < start + self.page_size:
+                yield self._emit(record)
+            elif seen >= start + self.page_size:
+                self.has_more = True
+            if received is not None:
+                received.append(record)
+            seen += 1
+        if paging_requested and seen > self.page_size + 1:
+            _mark_unpaged(self.endpoint, self.params, received)
+
+
+def send_data(endpoint, data=None, method="POST", timeout=None):
+    """
+    Send JSON to an endpoint through the shared pooled session (see fetch_data).
+
+    In write-behind mode (WRITE_BEHIND_DB set) a PUT that can't be delivered (network error,
+    5xx, 408 or 429) is stored in the durable queue instead of being lost, and so is any PUT
+    to a resource that already has one waiting, so writes reach the server in order. Queued
+    writes return {"queued": True}.
+    """
+    import requests
+
+    queue = write_queue() if method.upper() in WRITE_BEHIND_METHODS else None
+    if queue is not None and queue.has_pending(endpoint):
+        return _defer_write(queue, method, endpoint, data)
     try:
         headers = {
             "Authorization": f"Bearer {st.session_state.get('token', '')}",
             "Content-Type": "application/json"
         }
-        url = f"{BASE_URL}{endpoint}"
-        logger.info(f"Sending {method} request to {url} with data: {data}")
+        logger.debug("Sending %s %s with data: %s", method, endpoint, Redacted(data))
 
-        response = requests.request(method, url, headers=headers, json=data)
-        logger.debug(f"API Response: {response.status_code} - {response.text}")
+        response = _perform(method, endpoint, headers=headers, json=data, timeout=timeout)
+        logger.debug("API Response: %s - %s", response.status_code, Redacted(response.text))
+        if queue is not None and (response.status_code in WRITE_BEHIND_RETRY_STATUSES
+                                  or response.status_code >= 500):
+            return _defer_write(queue, method, endpoint, data)
 
-        return handle_response(response)
+        result, _ = _decode(method, endpoint, response)
+        if method.upper() != "GET" and response.status_code < 400 \
+                and normalize_path(endpoint) not in NON_MUTATING_ENDPOINTS:
+            # Write-through invalidation: drop the resource and its parent collections.
+            _cache().invalidate(endpoint)
+            _notify_write_listeners(method.upper(), endpoint, data)
+        return result
     except requests.exceptions.RequestException as e:
-        logger.exception(f"Request to {endpoint} failed: {e}")
+        if queue is not None:
+            logger.warning("Request to %s failed, queueing it: %s", endpoint, e)
+            return _defer_write(queue, method, endpoint, data)
+        logger.exception("Request to %s failed: %s", endpoint, e)
         st.error("A network error occurred. Please check your connection and try again.")
         return None
 
 
-def get_my_meetings(user_id):
+def send_data_in_background(endpoint, data=None, method="PUT", timeout=None):
     """
-    Fetches all meetings and filters them by the user's ID.
+    Send a write from the background pool and return immediately.
 
-    Args:
-        user_id (str): The logged-in user's ID.
+    The auth token is captured now, on the script thread; the request itself never
+    touches st.*, so it can finish after the rerun that started it. On success the
+    response cache is invalidated and write listeners are notified, as with send_data.
+
+    Returns:
+        concurrent.futures.Future: Resolves to (ok, result), where result is the parsed
+        response body on success and a short error message otherwise.
+    """
+    token = st.session_state.get('token', '')
+    _count_backend_call()
+    return _background_executor().submit(_send_detached, endpoint, data, method, token, timeout)
+
+
+def _send_detached(endpoint, data, method, token, timeout):
+    """Body of send_data_in_background; runs without a script context."""
+    status, detail = _write_with_token(method, endpoint, data, token, timeout)
+    return status is not None and status < 400, detail
+
+
+def _write_with_token(method, endpoint, data, token, timeout=None):
+    """
+    Send one write without touching st.* (usable off the script thread).
+
+    On success the response cache is invalidated and write listeners are notified.
 
     Returns:
-        list: List of meetings involving the user.
+        tuple: (status code, or None if the server couldn't be reached; parsed response
+        body on success, a short error message otherwise).
     """
     try:
-        logger.info(f"Fetching meetings for user {user_id}")
-        my_meetings = fetch_data(f"/meetings/user/{user_id}")
-        if not my_meetings:
-            logger.info("No meetings found for the user.")
-        return my_meetings or []
+        response = _perform(method, endpoint, count=False, timeout=timeout, json=data,
+                            headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"})
     except Exception as e:
-        logger.exception(f"Error fetching meetings for user {user_id}: {e}")
+        logger.warning("Background %s %s failed: %s", method, endpoint, e)
+        return None, "the server could not be reached"
+    if response.status_code >= 400:
+        try:
+            message = response.json().get("message") or response.json().get("detail")
+        except (ValueError, AttributeError):
+            message = None
+        logger.warning("Background %s %s rejected: %s - %s", method, endpoint, response.status_code,
+                       Redacted(response.text))
+        return response.status_code, message or f"the server answered {response.status_code}"
+    try:
+        result = loads(response.content)
+    except ValueError:
+        result = None
+    if normalize_path(endpoint) not in NON_MUTATING_ENDPOINTS:
+        _cache().invalidate(endpoint)
+        _notify_write_listeners(method.upper(), endpoint, data)
+    return response.status_code, result
+
+
+def bulk_fanout_limit():
+    """Parallel PUTs when a bulk update has to be sent meeting by meeting (BULK_FANOUT_CONCURRENCY)."""
+    return int(env("BULK_FANOUT_CONCURRENCY", "4"))
+
+
+def update_meetings_in_background(statuses, timeout=None):
+    """
+    Change the status of many meetings from the background pool and return immediately.
+
+    The changes go out as one POST to BULK_MEETINGS_ENDPOINT. If the backend doesn't have
+    it, they fall back to one PUT /meetings/{id} per meeting, at most bulk_fanout_limit()
+    at a time so a large selection doesn't flood the server.
+
+    Args:
+        statuses (dict): Meeting id -> new status.
+
+    Returns:
+        dict: Meeting id -> concurrent.futures.Future resolving to (ok, detail), as
+        send_data_in_background's futures do, so each meeting settles on its own.
+    """
+    token = st.session_state.get('token', '')
+    _count_backend_call()
+    futures = {meeting_id: Future() for meeting_id in statuses}
+    _background_executor().submit(_update_meetings_detached, dict(statuses), token, timeout, futures)
+    return futures
+
+
+def _update_meetings_detached(statuses, token, timeout, futures):
+    """Body of update_meetings_in_background; runs without a script context."""
+    try:
+        results = None if _bulk_unsupported else _update_meetings_bulk(statuses, token, timeout)
+        if results is None:
+            results = _update_meetings_one_by_one(statuses, token, timeout)
+    except Exception as e:  # every future must resolve, or the page would wait forever
+        logger.exception("Bulk meeting update failed: %s", e)
+        results = {}
+    for meeting_id, future in futures.items():
+        future.set_result(results.get(meeting_id, (False, "the server did not confirm the change")))
+
+
+def _update_meetings_bulk(statuses, token, timeout):
+    """
+    Send every status change in one request.
+
+    Returns:
+        dict or None: Meeting id -> (ok, detail), or None if the backend has no bulk endpoint.
+    """
+    global _bulk_unsupported
+    updates = [{"id": meeting_id, "status": status} for meeting_id, status in statuses.items()]
+    status_code, body = _write_with_token("POST", BULK_MEETINGS_ENDPOINT, {"updates": updates}, token, timeout)
+    if status_code in (404, 405):
+        logger.info("No %s on the backend; sending meeting updates one by one.", BULK_MEETINGS_ENDPOINT)
+        _bulk_unsupported = True
+        return None
+    if status_code is None or status_code >= 400:
+        return {meeting_id: (False, body) for meeting_id in statuses}
+    results = {}
+    for item in (body or {}).get("results", []) if isinstance(body, dict) else []:
+        if isinstance(item, dict) and item.get("id") in statuses:
+            results[item["id"]] = (bool(item.get("ok")), item.get("meeting") if item.get("ok") else
+                                   item.get("detail") or "the server rejected the change")
+    return results
+
+
+def _update_meetings_one_by_one(statuses, token, timeout):
+    """Fallback for backends without the bulk endpoint: parallel PUTs, bounded by bulk_fanout_limit()."""
+    meeting_ids = list(statuses)
+    calls = [partial(_send_detached, f"/meetings/{meeting_id}", {"status": statuses[meeting_id]}, "PUT", token,
+                     timeout) for meeting_id in meeting_ids]
+    results = {}
+    for meeting_id, (result, error) in zip(meeting_ids, gather(*calls, max_workers=bulk_fanout_limit())):
+        results[meeting_id] = result if error is None else (False, "the update could not be sent")
+    return results
+
+
+def _replay_queued_write(method, endpoint, data, token):
+    """WriteBehindQueue sender: deliver one queued write and classify the outcome."""
+    status, detail = _write_with_token(method, endpoint, data, token)
+    if status is not None and status < 400:
+        return "ok", None
+    if status is None or status in WRITE_BEHIND_RETRY_STATUSES or status >= 500:
+        return "retry", detail
+    return "failed", detail
+
+
+def write_queue():
+    """
+    The write-behind queue, or None unless WRITE_BEHIND_DB names a SQLite file (opt-in).
+
+    Backoff starts at WRITE_BEHIND_BACKOFF seconds (2), doubles per attempt up to
+    WRITE_BEHIND_MAX_BACKOFF (300), and a write is given up after WRITE_BEHIND_MAX_ATTEMPTS (20).
+    """
+    global _write_queue
+    if _write_queue is None and env("WRITE_BEHIND_DB"):
+        with _cache_lock:
+            if _write_queue is None:
+                from write_queue import WriteBehindQueue
+                _write_queue = WriteBehindQueue(
+                    env("WRITE_BEHIND_DB"), _replay_queued_write,
+                    base_backoff=float(env("WRITE_BEHIND_BACKOFF", "2")),
+                    max_backoff=float(env("WRITE_BEHIND_MAX_BACKOFF", "300")),
+                    max_attempts=int(env("WRITE_BEHIND_MAX_ATTEMPTS", "20")),
+                ).start()
+    return _write_queue
+
+
+def _defer_write(queue, method, endpoint, data):
+    """Queue a write for background delivery and tell the user it's been kept."""
+    queue.enqueue(method, endpoint, data, token=st.session_state.get('token', ''),
+                  user_id=st.session_state.get("user_id"))
+    st.info("The server can't be reached right now. Your change was saved and will be sent automatically.")
+    return {"queued": True}
+
+
+def gather(*calls, max_workers=None):
+    """
+    Run independent backend calls in parallel and wait for all of them.
+
+    Wall-clock time is that of the slowest call instead of the sum. Called from a script
+    thread, the worker threads get its Streamlit script context attached, so the calls can
+    keep using st.session_state and st.error like they do on the main thread; called from
+    anywhere else (e.g. the background pool), they run without one.
+
+    Args:
+        *calls: Zero-argument callables, e.g. functools.partial(fetch_data, "/teachers/1").
+        max_workers (int): Upper bound on parallel calls; defaults to GATHER_WORKERS (8).
+
+    Returns:
+        list: One (result, error) pair per call, in order; error is the exception the
+        call raised, or None.
+    """
+    global _gather_executor
+    if not calls:
         return []
 
+    def run(call):
+        try:
+            return call(), None
+        except Exception as e:
+            logger.exception("Concurrent call %r failed: %s", call, e)
+            return None, e
+
+    # Nested gathers (or a single call) run inline so a worker never waits on its own pool.
+    if len(calls) == 1 or getattr(_gather_local, "active", False):
+        return [run(call) for call in calls]
+
+    # At most max_workers tasks are submitted, each taking the next call when it is done
+    # with one, so calls beyond the limit queue here instead of holding pool workers.
+    ctx = get_script_run_ctx(suppress_warning=True)
+    pending = iter(enumerate(calls))
+    pending_lock = threading.Lock()
+    results = [None] * len(calls)
+    tasks = min(max_workers or len(calls), len(calls))
+
+    def run_in_worker():
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        _gather_local.active = True
+        try:
+            while True:
+                with pending_lock:
+                    item = next(pending, None)
+                if item is None:
+                    return
+                index, call = item
+                results[index] = run(call)
+        finally:
+            _gather_local.active = False
+
+    if ctx is None:
+        # Not called from a script thread (e.g. from the background pool). The shared workers
+        # keep the context of the rerun that last used them, so use threads that have none.
+        with ThreadPoolExecutor(max_workers=tasks, thread_name_prefix="gather-detached") as executor:
+            futures = [executor.submit(run_in_worker) for _ in range(tasks)]
+    else:
+        if _gather_executor is None:
+            with _executor_lock:
+                if _gather_executor is None:
+                    _gather_executor = ThreadPoolExecutor(max_workers=int(env("GATHER_WORKERS", "8")),
+                                                          thread_name_prefix="gather")
+        futures = [_gather_executor.submit(run_in_worker) for _ in range(tasks)]
+    for future in futures:
+        future.result()
+    return results
+
+
+def add_write_listener(callback):
+    """
+    Register callback(method, endpoint, data), called after every successful write
+    made through send_data, e.g. to keep an in-memory index in step with the backend.
+    """
+    _write_listeners.append(callback)
+
+
+def _notify_write_listeners(method, endpoint, data):
+    for callback in _write_listeners:
+        try:
+            callback(method, endpoint, data)
+        except Exception as e:
+            logger.exception("Write listener %r failed for %s %s: %s", callback, method, endpoint, e)
+
+
+def cache_stats():
+    """Return response cache hit/miss counters and conditional-GET savings (see ResponseCache.stats)."""
+    return _cache().stats()
+
+
+def metrics_snapshot():
+    """Per-endpoint request metrics summary rows (see RequestMetrics.snapshot)."""
+    return request_metrics.snapshot()
+
+
+def clear_cache():
+    """Drop every cached response, e.g. after logout."""
+    _cache().clear()
+
+
+def invalidate_cache(endpoint):
+    """Drop the cached responses a change to `endpoint` made stale, e.g. one pushed by the server."""
+    _cache().invalidate(endpoint)
+
+
+def _background_executor():
+    """Small shared pool for background work such as page prefetching."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=int(env("BACKGROUND_WORKERS", "4")),
+                                               thread_name_prefix="server-requests")
+    return _executor
+
+
+def _warm_cache(endpoint, params, token):
+    """
+    GET an endpoint and store the result in the response cache without touching the UI.
+
+    Runs on a background thread, so it must not use st.* (there is no script context).
+    """
+    try:
+        response = _perform("GET", endpoint, count=False, params=params,
+                            headers={"Authorization": f"Bearer {token}"})
+        if response.status_code == 200:
+            parse_started = time.perf_counter()
+            data = loads(response.content)
+            model = model_for(normalize_path(endpoint))
+            if model is not None:
+                data = to_records(data, model)
+            parse_seconds = time.perf_counter() - parse_started
+            request_metrics.observe_decode("GET", endpoint, parse_seconds)
+            _cache().put(ResponseCache.make_key(endpoint, params, token), data,
+                         validators=_validators_from(response), size=len(response.content),
+                         parse_seconds=parse_seconds)
+    except Exception as e:
+        logger.warning("Background fetch of %s failed: %s", endpoint, e)
+
+
+def _page_params(endpoint, page, page_size, params=None):
+    if normalize_path(endpoint) in _unpaged_endpoints:
+        return params or None
+    # Ask for one extra record so we know whether a next page exists.
+    return {**(params or {}), "skip": page * page_size, "limit": page_size + 1}
+
+
+def _mark_unpaged(endpoint, params, records):
+    """
+    Remember that `endpoint` ignores skip/limit, and cache the whole collection it sent
+    where the following pages look for it (see _page_params), so it isn't downloaded again.
+    """
+    logger.info("Endpoint %s ignores skip/limit; paging client-side.", endpoint)
+    _unpaged_endpoints.add(normalize_path(endpoint))
+    token = st.session_state.get('token', '')
+    _cache().put(ResponseCache.make_key(endpoint, params or None, token), records)
+
+
+def fetch_page(endpoint, page, page_size, params=None):
+    """
+    Fetch one page of a collection using skip/limit query parameters.
+
+    If the server ignores the paging parameters and returns the whole collection,
+    the endpoint is remembered and later pages are sliced from the cached full list.
+
+    Args:
+        endpoint (str): Collection endpoint, e.g. "/teachers/".
+        page (int): Zero-based page number.
+        page_size (int): Records per page.
+        params (dict): Extra query parameters (filters) sent with every page.
+
+    Returns:
+        tuple: (list of records on this page, True if there is a next page).
+    """
+    paging_requested = normalize_path(endpoint) not in _unpaged_endpoints
+    filters, params = params, _page_params(endpoint, page, page_size, params)
+    with _prefetch_lock:
+        pending = _prefetches.pop((normalize_path(endpoint), page, page_size), None)
+    if pending is not None:
+        pending.result()  # a prefetch for this page is in flight; reuse it instead of racing it
+
+    records = fetch_data(endpoint, params=params)
+    if not isinstance(records, list):
+        return [], False
+
+    if paging_requested and len(records) <= page_size + 1:
+        return records[:page_size], len(records) > page_size
+
+    if paging_requested:
+        _mark_unpaged(endpoint, filters, records)
+    start = page * page_size
+    return records[start:start + page_size], len(records) > start + page_size
+
+
+def prefetch_page(endpoint, page, page_size, params=None):
+    """Fetch a page in the background so that a later fetch_page() is served from the cache."""
+    params = _page_params(endpoint, page, page_size, params)
+    token = st.session_state.get('token', '')
+    if _cache().contains(ResponseCache.make_key(endpoint, params, token)):
+        return
+    key = (normalize_path(endpoint), page, page_size)
+    with _prefetch_lock:
+        for done_key in [k for k, future in _prefetches.items() if future.done()]:
+            del _prefetches[done_key]
+        if key in _prefetches:
+            return
+        _prefetches[key] = _background_executor().submit(_warm_cache, endpoint, params, token)
+
 
 # Meeting Management
-def request_meeting_with_teacher(teacher):
+def _use_meeting_slot(teacher_id, start, end):
+    """on_click for a suggested slot: move the request form's inputs to it."""
+    st.session_state[f"meeting_date_{teacher_id}"] = start.date()
+    st.session_state[f"meeting_start_{teacher_id}"] = start.time()
+    st.session_state[f"meeting_finish_{teacher_id}"] = end.time()
+
+
+def _show_meeting_conflict(teacher, schedule, start, finish):
+    """
+    Check the requested slot against the teacher's schedule and offer the nearest free
+    slots if it clashes.
+
+    Returns:
+        bool: True if the slot is free.
+    """
+    # Imported here so importing this module doesn't read the environment (see config.env).
+    from time_format import format_interval, LONG_DATETIME, TIME_12H
+
+    conflict = schedule.conflict(start, finish)
+    if conflict is None:
+        st.caption(f"✅ {teacher.get('name', 'The teacher')} is free then.")
+        return True
+    reason, clash = conflict
+    if clash is not None:
+        booked = format_interval(clash, TIME_12H, TIME_12H) or clash
+        st.warning(f"This overlaps a meeting the teacher already has ({booked[0]} – {booked[1]}).")
+    else:
+        st.warning("The teacher isn't available at that time.")
+    suggestions = schedule.suggest(start, finish, not_before=datetime.now())
+    if suggestions:
+        st.markdown("Nearest free slots:")
+        for slot_start, slot_end in suggestions:
+            label = " → ".join(format_interval((slot_start, slot_end), LONG_DATETIME, TIME_12H))
+            st.button(label, key=f"meeting_slot_{teacher.get('id')}_{slot_start.isoformat()}",
+                      on_click=_use_meeting_slot, args=(teacher.get("id"), slot_start, slot_end))
+    else:
+        st.info("No free slot of that length was found near that time.")
+    return False
+
+
+def request_meeting_with_teacher(teacher, schedule=None):
     """
     Create a meeting instance using the selected teacher's data and provided meeting details.
 
     Args:
         teacher (dict): The teacher's JSON data.
+        schedule (TeacherSchedule): The teacher's availability and booked time; when
+            given, the requested slot is checked against it as the inputs change, and a
+            clashing request is not sent.
     """
     try:
         st.subheader(f"Request Meeting with {teacher.get('name', 'N/A')}")
 
         # Allow the student to input meeting details
-        meeting_subject = st.text_input("Meeting Subject", help="Enter the subject of the meeting.")
-        meeting_location = st.text_input("Meeting Location", help="Enter the meeting location.")
-        start_time = st.time_input("Start Time", help="Set the meeting's start time.")
-        finish_time = st.time_input("Finish Time", help="Set the meeting's end time.")
+        teacher_id = teacher.get("id")
+        meeting_subject = st.text_input("Meeting Subject", help="Enter the subject of the meeting.",
+                                        key=f"meeting_subject_{teacher_id}")
+        meeting_location = st.text_input("Meeting Location", help="Enter the meeting location.",
+                                         key=f"meeting_location_{teacher_id}")
+        meeting_date = st.date_input("Date", help="Set the meeting's day.", key=f"meeting_date_{teacher_id}")
+        start_time = st.time_input("Start Time", help="Set the meeting's start time.",
+                                   key=f"meeting_start_{teacher_id}")
+        finish_time = st.time_input("Finish Time", help="Set the meeting's end time.",
+                                    key=f"meeting_finish_{teacher_id}")
+        start = datetime.combine(meeting_date, start_time)
+        finish = datetime.combine(meeting_date, finish_time)
 
-        if st.button("Request Meeting"):
+        slot_free = True
+        if schedule is not None and finish > start:
+            slot_free = _show_meeting_conflict(teacher, schedule, start, finish)
+
+        if st.button("Request Meeting", key=f"meeting_request_{teacher_id}"):
             if not meeting_subject or not meeting_location:
                 st.warning("Please provide both subject and location for the meeting.")
                 return
 
-            if finish_time <= start_time:
+            if finish <= start:
                 st.warning("Finish time must be after start time.")
                 return
 
+            if not slot_free:
+                st.warning("Please pick a time the teacher is free.")
+                return
+
             # Build the meeting payload
             meeting_data = {
                 "location": meeting_location,
-                "start_time": start_time.isoformat(),
-                "finish_time": finish_time.isoformat(),
+                "start_time": start.isoformat(),
+                "finish_time": finish.isoformat(),
                 "subject": meeting_subject,
                 "people": [
                     {"id": teacher['id'], "role": "Teacher", "name": teacher.get('name', 'N/A')},
@@ -136,35 +1028,35 @@ def request_meeting_with_teacher(teacher):
             # Send the meeting request to the `/meetings/` endpoint
             response = send_data("/meetings/", meeting_data)
             if response:
-                logger.info(f"Meeting created successfully: {response}")
+                logger.info("Meeting created successfully: %s", Redacted(response))
+                # The slot is taken now; refetch the teacher's booked time (see teacher_schedule).
+                invalidate_cache(f"/teachers/{teacher_id}/busy")
                 st.success("Meeting successfully created!")
             else:
-                logger.error(f"Failed to create meeting: {meeting_data}")
+                logger.error("Failed to create meeting: %s", Redacted(meeting_data))
                 st.error("Failed to create the meeting. Please try again.")
     except Exception as e:
-        logger.exception(f"Error requesting meeting with teacher {teacher.get('id')}: {e}")
+        logger.exception("Error requesting meeting with teacher %s: %s", teacher.get('id'), e)
         st.error("An unexpected error occurred. Please try again.")
 
 
-def get_my_meetings(user_id):  #
+def get_my_meetings(user_id, status=None):  #
     try:
-        logger.info(f"Fetching meetings for user ID: {user_id}")
+        logger.debug("Fetching meetings for user ID: %s", user_id)
         if not user_id:
             logger.error("User ID is None. Cannot fetch meetings.")
             st.error("Please log in to view your meetings.")
             return []
 
-        endpoint = f"/meetings/user/{user_id}"  # we dont have the endpoint we want to get all meeting and go over
-        # them and append the relevant meetings.
-        meetings = fetch_data(endpoint)
+        meetings = fetch_user_meetings(user_id, status=status)
         if meetings:
-            logger.info(f"Retrieved {len(meetings)} meetings for user {user_id}")
+            logger.debug("Retrieved %d meetings for user %s", len(meetings), user_id)
             return meetings
         else:
-            logger.info(f"No meetings found for user {user_id}")
+            logger.debug("No meetings found for user %s", user_id)
             return []
     except Exception as e:
-        logger.exception(f"Error fetching meetings for user {user_id}: {e}")
+        logger.exception("Error fetching meetings for user %s: %s", user_id, e)
         st.error("Failed to load meetings. Please try again later.")
         return []
 
@@ -181,25 +1073,74 @@ def update_profile(about_section):
     endpoint = f"/users/{user_id}"
     response = send_data(endpoint, payload, method="PUT")
     if response:
-        logger.info(f"Profile updated successfully for user {user_id}")
+        logger.info("Profile updated successfully for user %s", user_id)
         st.success("Profile updated successfully!")
     else:
-        logger.error(f"Failed to update profile for user {user_id}")
+        logger.error("Failed to update profile for user %s", user_id)
         st.error("Failed to update profilee. Please try again.")
 
 
-def fetch_user_meetings(user_id):
-    """Fetch and filter meetings where the user is a participant."""
+def _meeting_matches(meeting, status=None, start=None, end=None):
+    """Local re-check of the server-side filters, for backends that ignore them."""
+    if status and meeting.get("status") != status:
+        return False
+    if start or end:
+        try:
+            meeting_start = meeting.get("start_time", "")
+            if not isinstance(meeting_start, datetime):
+                meeting_start = datetime.fromisoformat(meeting_start)
+            if start and meeting_start < start:
+                return False
+            if end and meeting_start >= end:
+                return False
+        except (TypeError, ValueError):
+            return False  # no usable date on record, so it can't be placed in the range
+    return True
+
+
+def fetch_user_meetings(user_id, status=None, start=None, end=None, page_size=None, max_pages=None):
+    """
+    Fetch the meetings a user takes part in.
+
+    Queries /meetings/user/{user_id} so only this user's meetings cross the wire, lets the
+    server filter by status and start-time range, and pages through long histories with
+    skip/limit. The filters are re-applied locally in case the backend ignores them.
+
+    Args:
+        user_id (str): The participant's ID.
+        status (str): Only meetings with this status, e.g. "Approved".
+        start (datetime): Only meetings starting at or after this time.
+        end (datetime): Only meetings starting before this time.
+        page_size (int): Meetings requested per round trip; defaults to MEETINGS_PAGE_SIZE (100).
+        max_pages (int): Stop after this many pages; defaults to MEETINGS_MAX_PAGES (5), so a
+            long history costs a bounded number of round trips.
+
+    Returns:
+        list: The user's matching meetings.
+    """
     try:
-        response = fetch_data("/meetings/")  # Fetch all meetings
-        if not response or not isinstance(response, list):
-            st.error("Failed to fetch meetings or no meetings found.")
-            return []
+        endpoint = f"/meetings/user/{user_id}"
+        filters = {}
+        if status:
+            filters["status"] = status
+        if start:
+            filters["start"] = start.isoformat()
+        if end:
+            filters["end"] = end.isoformat()
 
-        # Filter meetings where user_id is in the 'people' list
-        user_meetings = [meeting for meeting in response if user_id in meeting.get("people", [])]
-        return user_meetings
+        page_size = page_size or meetings_page_size()
+        max_pages = max_pages or meetings_max_pages()
+        meetings = []
+        for page in range(max_pages):
+            records, has_more = fetch_page(endpoint, page, page_size, params=filters)
+            meetings.extend(m for m in records if isinstance(m, Mapping) and _meeting_matches(m, status, start, end))
+            if not has_more:
+                break
+        else:
+            logger.info("Meetings of user %s cut off after %d pages of %d.", user_id, max_pages, page_size)
+        return meetings
     except Exception as e:
+        logger.exception("Error fetching meetings for user %s: %s", user_id, e)
         st.error(f"An error occurred while fetching meetings: {e}")
         return []
 
@@ -222,71 +1163,46 @@ def get_user_data(user_id):
     try:
         # Construct the endpoint to fetch user data
         endpoint = f"/users/id/{user_id}"
-        logger.info(f"Fetching data for user ID: {user_id}")
+        logger.debug("Fetching data for user ID: %s", user_id)
 
         # Make the API call
         user_data = fetch_data(endpoint)
 
-        # Optionally, process or log the user data if needed
         if user_data:
-            logger.info(f"Retrieved data for user {user_id}: {user_data}")
+            logger.debug("Retrieved data for user %s: %s", user_id, Redacted(user_data))
         else:
-            logger.info(f"No data found for user {user_id}")
+            logger.info("No data found for user %s", user_id)
 
         return user_data
     except Exception as e:
-        logger.exception(f"Error fetching data for user {user_id}: {e}")
+        logger.exception("Error fetching data for user %s: %s", user_id, e)
         st.error("Failed to fetch user data. Please try again later.")
         return None
 
 
 def check_existing_profile(profile_type):
-    """Check if a profile already exists for the user by fetching all profiles of the given type and checking for user ID."""
-    if profile_type == "Student":
-        endpoint = "/students/"
-    elif profile_type == "Teacher":
-        endpoint = "/teachers/"
-    else:
-        raise ValueError("Invalid profile type specified")
-
-    all_profiles = fetch_data(endpoint)
-    print("Fetched profiles:", all_profiles)  # Debug output to see what is fetched
+    """
+    Return the logged-in user's Student or Teacher profile, or None if they don't have one.
 
-    if not all_profiles:  # Checks if list is empty or None
-        st.error("No profiles found or failed to fetch profiles.")
-        return None
+    Looks the profile up by id instead of scanning the whole collection, so the cost
+    doesn't grow with the number of profiles. "No such profile" answers are negatively
+    cached until a profile of that type is created (the POST invalidates them).
+    """
+    endpoint = PROFILE_ENDPOINTS.get(profile_type)
+    if endpoint is None:
+        raise ValueError("Invalid profile type specified")
 
     user_id = st.session_state.get('user_id')  # Safely get the user_id with a fallback
     if user_id is None:
         st.error("User ID not set in session state.")
         return None
 
-    for profile in all_profiles:
-        if profile.get("id") == user_id:
-            return profile  # Profile exists
+    profile = fetch_data(f"{endpoint}/{user_id}", allow_missing=True)
+    return profile if isinstance(profile, Mapping) else None
 
-    return None  # No profile found
 
-
-def fetch_teacher(teacher_id: str) -> Optional[dict]:
+def fetch_teacher(teacher_id: str) -> Optional[Teacher]:
+    """The teacher's document, validated (see models.Teacher), or None if it's missing or invalid."""
     data = fetch_data(f"/teachers/{teacher_id}")
-    return data if isinstance(data, dict) else None
-
-
-def validate_teacher_dict(data: dict) -> Optional[dict]:
-    """
-    Lightweight frontend validation for teacher data.
-
-    Returns:
-        dict if valid, otherwise None
-    """
-    required_keys = [
-        "name", "email", "available", "subjects_to_teach", "meetings"
-    ]
-    if not isinstance(data, dict):
-        return None
-    for key in required_keys:
-        if key not in data:
-            return None
-    return data
+    return data if isinstance(data, Teacher) else None
 
@@ -1,7 +1,284 @@
-from server_requests import *
 import streamlit as st
-from update_meeting import handle_meeting_actions
-from datetime import datetime
+from collections.abc import Mapping
+from server_requests import (gather, send_data, request_meeting_with_teacher, logger,
+                             MEETING_STATUS_FILTERS)
+from meeting_stream import watch_meeting_stream
+from update_meeting import handle_meeting_actions, reconcile_meeting_actions, watch_meeting_actions
+from fragments import dashboard_fragment
+from functools import partial
+from time_format import format_interval, format_time, LONG_DATETIME, TIME_12H
+from teacher_search import get_teacher_index
+from intervals import IntervalSet
+from repositories import student_repo, teacher_repo, meeting_repo
+from meeting_conflicts import teacher_schedule
+from models import SUBJECTS as ALL_SUBJECTS
+
+
+TEACHER_PAGE_SIZES = [5, 10, 20, 50]
+
+
+def _reset_teacher_page():
+    st.session_state.teacher_page = 0
+
+
+def _change_teacher_page(delta):
+    st.session_state.teacher_page = max(0, st.session_state.get("teacher_page", 0) + delta)
+
+
+def _toggle_meeting_request(teacher_id):
+    """on_click of a card's button: open that teacher's request form, or close it if open."""
+    open_id = st.session_state.get("meeting_request_teacher")
+    st.session_state.meeting_request_teacher = None if open_id == teacher_id else teacher_id
+
+
+def render_teacher_card(teacher, overlap_minutes=None):
+    """Render one teacher card with its "Request Meeting" button."""
+    name = teacher.get("name", "N/A")
+    email = teacher.get("email", "N/A")
+    phone = teacher.get("phone", "N/A")
+    rate = teacher.get("hourly_rate")
+    rate = f"{rate:g}" if isinstance(rate, (int, float)) else rate or "N/A"
+    rating = teacher.get("rating", "N/A")
+    subjects = ", ".join(teacher.get("subjects_to_teach", []))
+    availability = teacher.get("available", [])
+
+    availability_str = ""
+    for interval in availability:
+        formatted = format_interval(interval, LONG_DATETIME, TIME_12H)
+        if formatted:
+            availability_str += f"📅 {formatted[0]} → {formatted[1]}<br>"
+        elif isinstance(interval, Mapping):
+            availability_str += f"{interval.get('start', '')} → {interval.get('end', '')}<br>"
+
+    st.markdown(f"""
+        <div style='background-color:#2c2f33; padding:15px; border-radius:10px; margin-bottom:20px; color:#f0f0f0'>
+            <h4>👤 <strong>{name}</strong></h4>
+            <p>📧 <strong>Email:</strong> {email}<br>
+               📞 <strong>Phone:</strong> {phone}<br>
+               💰 <strong>Hourly Rate:</strong> ${rate}<br>
+               ⭐ <strong>Rating:</strong> {rating}/5<br>
+               📘 <strong>Subjects:</strong> {subjects}<br>
+               ⏱️ <strong>Availability:</strong><br>{availability_str}</p>
+            <form action='#'>
+                <button style='background-color:#4CAF50; color:white; border:none; padding:10px 15px; border-radius:5px; cursor:pointer'
+                        onclick="document.getElementById('{teacher.get("id")}').click(); return false;">
+                    Request Meeting with {name}
+                </button>
+            </form>
+        </div>
+    """, unsafe_allow_html=True)
+
+    if overlap_minutes:
+        st.caption(f"🕒 {overlap_minutes / 60:.1f} h of overlap with your availability")
+    st.button(f"", key=teacher.get("id"), on_click=_toggle_meeting_request, args=(teacher.get("id"),))
+    if st.session_state.get("meeting_request_teacher") == teacher.get("id"):
+        request_meeting_with_teacher(teacher, teacher_schedule(teacher))
+
+
+@dashboard_fragment("Student: Available Teachers")
+def available_teachers_section():
+    """Search, filter and page through the teacher directory."""
+    st.subheader("🧑‍🏫 Available Teachers")
+
+    try:
+        page_size = st.selectbox("Teachers per page", TEACHER_PAGE_SIZES, index=1,
+                                 key="teacher_page_size", on_change=_reset_teacher_page)
+        page = st.session_state.setdefault("teacher_page", 0)
+
+        with st.expander("🔎 Search & Filter"):
+            name_query = st.text_input("Teacher Name", key="teacher_name_query", on_change=_reset_teacher_page)
+            subject_filter = st.multiselect("Subjects", options=ALL_SUBJECTS, key="teacher_subject_filter",
+                                            on_change=_reset_teacher_page)
+            max_rate = st.number_input("Max Hourly Rate (0 = any)", min_value=0, step=5,
+                                       key="teacher_max_rate", on_change=_reset_teacher_page)
+            min_rating = st.slider("Minimum Rating", 0.0, 5.0, 0.0, 0.5,
+                                   key="teacher_min_rating", on_change=_reset_teacher_page)
+            match_availability = st.checkbox("Only teachers available when I am (best match first)",
+                                             key="teacher_match_availability", on_change=_reset_teacher_page)
+        filtering = bool(name_query.strip() or subject_filter or max_rate or min_rating or match_availability)
+
+        overlaps = {}
+        if filtering:
+            # Filtered queries run against the in-memory index and are paged locally.
+            index = get_teacher_index()
+            matches = index.query(
+                subjects=subject_filter,
+                max_rate=max_rate or None,
+                min_rating=min_rating or None,
+                name_prefix=name_query,
+            )
+            if match_availability:
+                from availability_match import packed_for_index, rank_by_overlap  # loads NumPy
+                student_data = student_repo.get(st.session_state.get('user_id'))
+                my_slots = IntervalSet.from_wire(
+                    student_data.get("available") if isinstance(student_data, Mapping) else [])
+                if not my_slots:
+                    st.info("Add availability to your profile to match it against teachers.")
+                ranked = rank_by_overlap(matches, my_slots, packed_for_index(index))
+                matches = [teacher for teacher, _ in ranked]
+                overlaps = {teacher.get("id"): minutes for teacher, minutes in ranked}
+            start = page * page_size
+            teachers, has_more = matches[start:start + page_size], len(matches) > start + page_size
+        else:
+            # Cards render as the teachers arrive; has_more is known once the page is read.
+            teachers = teacher_repo.stream(page, page_size)
+        shown = 0
+        for teacher in teachers:
+            shown += 1
+            if teacher.get("id") == st.session_state.get("user_id"):
+                continue
+            render_teacher_card(teacher, overlaps.get(teacher.get("id")))
+        if not filtering:
+            has_more = teachers.has_more
+        if shown:
+            # Warm the cache for the next page while the user reads this one.
+            if has_more and not filtering:
+                teacher_repo.prefetch(page + 1, page_size)
+
+            prev_col, page_col, next_col = st.columns([1, 2, 1])
+            with prev_col:
+                st.button("⬅️ Previous", disabled=page == 0, on_click=_change_teacher_page, args=(-1,))
+            with page_col:
+                st.markdown(f"Page {page + 1}")
+            with next_col:
+                st.button("Next ➡️", disabled=not has_more, on_click=_change_teacher_page, args=(1,))
+        elif page > 0:
+            # The list shrank below this page. A plain rerun, as this may be a full-app run,
+            # where a fragment-scoped one raises.
+            _reset_teacher_page()
+            st.rerun()
+        else:
+            st.info("No teachers found.")
+    except Exception as e:
+        logger.exception("Error fetching teachers.")
+        st.error("Failed to load teacher data. Please try again later.")
+
+
+@dashboard_fragment("Student: My Meetings")
+def my_meetings_section():
+    """List the student's meetings and allow cancelling them."""
+    st.subheader("Your Meetings")
+    try:
+        status_filter = st.selectbox("Status", MEETING_STATUS_FILTERS, key="student_meeting_status")
+        status = None if status_filter == "All" else status_filter
+        student_meetings = reconcile_meeting_actions(meeting_repo.for_user(st.session_state.user_id, status=status),
+                                                     status_filter=status)
+        if student_meetings:
+            for meeting in student_meetings:
+                st.write(f"**Subject:** {meeting.get('topic', 'N/A')}")
+                st.write(f"**Teacher:** {meeting.get('teacher_name', 'N/A')}")
+                st.write(f"**Scheduled Time:** {format_time(meeting.get('scheduled_time'), LONG_DATETIME) or 'N/A'}")
+                st.write(f"**Status:** {meeting.get('status', 'N/A')}"
+                         + (" _(saving…)_" if meeting.get("pending_action") else ""))
+                st.button(f"Cancel Meeting: {meeting.get('topic')}", key=meeting.get('id'),
+                          disabled=meeting.get("status") == "Canceled",
+                          on_click=handle_meeting_actions, args=(meeting.get('id'), "Cancel", meeting.get("status")))
+                st.write("---")
+        else:
+            logger.info("No meetings found for student.")
+            st.info("No meetings found.")
+        watch_meeting_actions()
+        watch_meeting_stream()
+    except Exception as e:
+        logger.exception("Error fetching meetings for student.")
+        st.error("Failed to load meetings. Please try again later.")
+
+
+# -------------------------
+# Edit Profile Section
+# -------------------------
+@dashboard_fragment("Student: Edit Profile")
+def edit_profile_section():
+    """Edit the student profile and login email."""
+    st.subheader("🛠️ Edit Your Profile")
+    user_id = st.session_state.get("user_id")
+    try:
+        existing_data = student_repo.get(user_id)
+        if not existing_data:
+            st.error("Failed to load your profile.")
+        else:
+            # --- Pre-fill form fields
+            name = st.text_input("Full Name", value=existing_data.get("name", ""))
+            about_section = st.text_area("About Me", value=existing_data.get("about_section", ""))
+            phone = st.text_input("Phone Number", value=existing_data.get("phone", ""))
+            email = st.text_input("Email", value=existing_data.get("email", ""))
+            # --- Normalize existing subjects into the same casing
+            raw = existing_data.get("subjects_interested_in_learning", [])
+            default_subjects = [s.title() for s in raw if s]  # e.g. "chemistry" → "Chemistry"
+            # --- Keep subjects outside ALL_SUBJECTS selectable, or the widget would reject them
+            selected_subjects = st.multiselect("Subjects Interested In",
+                                               options=ALL_SUBJECTS + [s for s in default_subjects
+                                                                       if s not in ALL_SUBJECTS],
+                                               default=default_subjects)
+            if st.button("Update Profile"):
+                updated_data = existing_data.copy()
+                updated_data["name"] = name.strip()
+                updated_data["about_section"] = about_section.strip()
+                updated_data["phone"] = phone.strip()
+                updated_data["email"] = email.strip()
+                # If you want to send them back as lowercase, map `.lower()` here; otherwise leave as-is
+                updated_data["subjects_interested_in_learning"] = [s.lower() for s in selected_subjects]
+                user_payload = {"email": email.strip()}
+                # The profile and login-email updates are independent; send them in parallel.
+                (ok1, _), (ok2, _) = gather(
+                    partial(send_data, f"/students/{user_id}", updated_data, method="PUT"),
+                    partial(send_data, f"/users/{user_id}", user_payload, method="PUT"),
+                )
+                if ok1 and ok2:
+                    # keep your session in sync
+                    st.session_state["user_email"] = email.strip()
+                    st.success("Profile (and login email) updated successfully!")
+                else:
+                    st.error("Something went wrong updating your profile/email.")
+    except Exception:
+        logger.exception("Failed to load student profile for editing.")
+        st.error("An unexpected error occurred while loading your profile.")
+
+
+@dashboard_fragment("Student: My Profile")
+def my_profile_section():
+    """Read-only view of the student profile."""
+    st.subheader("📋 My Profile")
+
+    try:
+        user_id = st.session_state.get("user_id")
+        student_data = student_repo.get(user_id)
+
+        if student_data:
+            st.markdown("### 👤 Personal Information")
+            st.write(f"**Name:** {student_data.get('name', 'N/A')}")
+            st.write(f"**Email:** {student_data.get('email', 'N/A')}")
+            st.write(f"**Phone:** {student_data.get('phone', 'N/A')}")
+
+            st.markdown("### 🧾 About Me")
+            st.write(student_data.get("about_section", "_No info provided._"))
+
+            st.markdown("### 📚 Subjects Interested In")
+            subjects = student_data.get("subjects_interested_in_learning", [])
+            st.write(", ".join(subjects) if subjects else "_None listed._")
+
+            st.markdown("### 🕒 Availability")
+            availability = student_data.get("available", [])
+            if availability:
+                for i, interval in enumerate(availability):
+                    formatted = format_interval(interval, LONG_DATETIME, LONG_DATETIME)
+                    if formatted:
+                        html = (
+                            f"<span style='color:gold'><strong>From:</strong></span> {formatted[0]} → "
+                            f"<span style='color:gold'><strong>To:</strong></span> {formatted[1]}"
+                        )
+                        st.markdown(f"{i + 1}. {html}", unsafe_allow_html=True)
+                    elif isinstance(interval, Mapping):
+                        st.write(
+                            f"{i + 1}. **From:** {interval.get('start', 'N/A')} → **To:** {interval.get('end', 'N/A')}")
+            else:
+                st.write("_No availability set._")
+
+        else:
+            st.warning("Unable to fetch profile data. Please try again later.")
+    except Exception as e:
+        logger.exception("Failed to load student profile.")
+        st.error("An unexpected error occurred while loading your profile.")
 
 
 def student_view():
@@ -13,169 +290,10 @@ def student_view():
     choice = st.sidebar.radio("Menu", options)
 
     if choice == "Available Teachers":
-        st.subheader("🧑‍🏫 Available Teachers")
-
-        try:
-            teachers = fetch_data("/teachers/")
-            if teachers:
-                for teacher in teachers:
-                    if teacher.get("id") == st.session_state.get("user_id"):
-                        continue
-
-                    name = teacher.get("name", "N/A")
-                    email = teacher.get("email", "N/A")
-                    phone = teacher.get("phone", "N/A")
-                    rate = teacher.get("hourly_rate", "N/A")
-                    rating = teacher.get("rating", "N/A")
-                    subjects = ", ".join(teacher.get("subjects_to_teach", []))
-                    availability = teacher.get("available", [])
-
-                    availability_str = ""
-                    for interval in availability:
-                        try:
-                            start = datetime.fromisoformat(interval["start"]).strftime("%A, %B %d, %Y at %I:%M %p")
-                            end = datetime.fromisoformat(interval["end"]).strftime("%I:%M %p")
-                            availability_str += f"📅 {start} → {end}<br>"
-                        except:
-                            availability_str += f"{interval.get('start', '')} → {interval.get('end', '')}<br>"
-
-                    st.markdown(f"""
-                        <div style='background-color:#2c2f33; padding:15px; border-radius:10px; margin-bottom:20px; color:#f0f0f0'>
-                            <h4>👤 <strong>{name}</strong></h4>
-                            <p>📧 <strong>Email:</strong> {email}<br>
-                               📞 <strong>Phone:</strong> {phone}<br>
-                               💰 <strong>Hourly Rate:</strong> ${rate}<br>
-                               ⭐ <strong>Rating:</strong> {rating}/5<br>
-                               📘 <strong>Subjects:</strong> {subjects}<br>
-                               ⏱️ <strong>Availability:</strong><br>{availability_str}</p>
-                            <form action='#'>
-                                <button style='background-color:#4CAF50; color:white; border:none; padding:10px 15px; border-radius:5px; cursor:pointer'
-                                        onclick="document.getElementById('{teacher.get("id")}').click(); return false;">
-                                    Request Meeting with {name}
-                                </button>
-                            </form>
-                        </div>
-                    """, unsafe_allow_html=True)
-
-                    st.button(f"", key=teacher.get("id"), on_click=request_meeting_with_teacher, args=(teacher,))
-            else:
-                st.info("No teachers found.")
-        except Exception as e:
-            logger.exception("Error fetching teachers.")
-            st.error("Failed to load teacher data. Please try again later.")
-
+        available_teachers_section()
     elif choice == "My Meetings":
-        st.subheader("Your Meetings")
-        try:
-            student_meetings = get_my_meetings(st.session_state.user_id)
-            if student_meetings:
-                for meeting in student_meetings:
-                    st.write(f"**Subject:** {meeting.get('topic', 'N/A')}")
-                    st.write(f"**Teacher:** {meeting.get('teacher_name', 'N/A')}")
-                    st.write(f"**Scheduled Time:** {meeting.get('scheduled_time', 'N/A')}")
-                    if st.button(f"Cancel Meeting: {meeting.get('topic')}", key=meeting.get('id')):
-                        handle_meeting_actions(meeting.get('id'), "Cancel")
-                    st.write("---")
-            else:
-                logger.info("No meetings found for student.")
-                st.info("No meetings found.")
-        except Exception as e:
-            logger.exception("Error fetching meetings for student.")
-            st.error("Failed to load meetings. Please try again later.")
-    # -------------------------
-    # Edit Profile Section
-    # -------------------------
+        my_meetings_section()
     elif choice == "Edit Profile":
-        st.subheader("🛠️ Edit Your Profile")
-        user_id = st.session_state.get("user_id")
-        try:
-            existing_data = fetch_data(f"/students/{user_id}")
-            if not existing_data:
-                st.error("Failed to load your profile.")
-            else:
-                # --- Pre-fill form fields
-                name = st.text_input("Full Name", value=existing_data.get("name", ""))
-                about_section = st.text_area("About Me", value=existing_data.get("about_section", ""))
-                phone = st.text_input("Phone Number", value=existing_data.get("phone", ""))
-                email = st.text_input("Email", value=existing_data.get("email", ""))
-                # --- Define your master list of allowed subjects
-                all_subjects = [
-
-                    "Math", "Physics", "Chemistry", "Biology",
-
-                    "English", "Computer Science", "History", "Economics"
-
-                ]
-                # --- Normalize existing subjects into the same casing
-                raw = existing_data.get("subjects_interested_in_learning", [])
-                default_subjects = [s.title() for s in raw]  # e.g. "chemistry" → "Chemistry"
-                # --- Now the defaults all appear in `all_subjects`
-                selected_subjects = st.multiselect("Subjects Interested In", options=all_subjects,
-                                                   default=default_subjects)
-                if st.button("Update Profile"):
-                    updated_data = existing_data.copy()
-                    updated_data["name"] = name.strip()
-                    updated_data["about_section"] = about_section.strip()
-                    updated_data["phone"] = phone.strip()
-                    updated_data["email"] = email.strip()
-                    # If you want to send them back as lowercase, map `.lower()` here; otherwise leave as-is
-                    updated_data["subjects_interested_in_learning"] = [s.lower() for s in selected_subjects]
-                    ok1 = send_data(f"/students/{user_id}", updated_data, method="PUT")
-                    user_payload = {"email": email.strip()}
-                    ok2 = send_data(f"/users/{user_id}", user_payload, method="PUT")
-                    if ok1 and ok2:
-                        # keep your session in sync
-                        st.session_state["user_email"] = email.strip()
-                        st.success("Profile (and login email) updated successfully!")
-                    else:
-                        st.error("Something went wrong updating your profile/email.")
-        except Exception:
-            logger.exception("Failed to load student profile for editing.")
-            st.error("An unexpected error occurred while loading your profile.")
-
+        edit_profile_section()
     elif choice == "My Profile":
-        st.subheader("📋 My Profile")
-
-        try:
-            user_id = st.session_state.get("user_id")
-            student_data = fetch_data(f"/students/{user_id}")
-
-            if student_data:
-                st.markdown("### 👤 Personal Information")
-                st.write(f"**Name:** {student_data.get('name', 'N/A')}")
-                st.write(f"**Email:** {student_data.get('email', 'N/A')}")
-                st.write(f"**Phone:** {student_data.get('phone', 'N/A')}")
-
-                st.markdown("### 🧾 About Me")
-                st.write(student_data.get("about_section", "_No info provided._"))
-
-                st.markdown("### 📚 Subjects Interested In")
-                subjects = student_data.get("subjects_interested_in_learning", [])
-                st.write(", ".join(subjects) if subjects else "_None listed._")
-
-                st.markdown("### 🕒 Availability")
-                availability = student_data.get("available", [])
-                if availability:
-                    for i, interval in enumerate(availability):
-                        try:
-                            start_dt = datetime.fromisoformat(interval.get("start", ""))
-                            end_dt = datetime.fromisoformat(interval.get("end", ""))
-                            start_str = start_dt.strftime("%A, %B %d, %Y at %I:%M %p")
-                            end_str = end_dt.strftime("%A, %B %d, %Y at %I:%M %p")
-
-                            html = (
-                                f"<span style='color:gold'><strong>From:</strong></span> {start_str} → "
-                                f"<span style='color:gold'><strong>To:</strong></span> {end_str}"
-                            )
-                            st.markdown(f"{i + 1}. {html}", unsafe_allow_html=True)
-                        except Exception as e:
-                            st.write(
-                                f"{i + 1}. **From:** {interval.get('start', 'N/A')} → **To:** {interval.get('end', 'N/A')}")
-                else:
-                    st.write("_No availability set._")
-
-            else:
-                st.warning("Unable to fetch profile data. Please try again later.")
-        except Exception as e:
-            logger.exception("Failed to load student profile.")
-            st.error("An unexpected error occurred while loading your profile.")
+        my_profile_section()
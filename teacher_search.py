@@ -0,0 +1,248 @@
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from collections.abc import Mapping
+
+from models import Teacher, ValidationError
+from server_requests import stream_data, add_write_listener, logger, CACHE_TTLS
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _indexed_fields(teacher):
+    """The fields the index is built on; a document is only re-indexed when these change."""
+    subjects = tuple(sorted({s.strip().lower() for s in teacher.get("subjects_to_teach", []) or [] if s}))
+    return (
+        (teacher.get("name") or "").lower(),
+        _number(teacher.get("hourly_rate")),
+        _number(teacher.get("rating")),
+        subjects,
+    )
+
+
+class TeacherIndex:
+    """
+    In-memory search index over teacher documents.
+
+    - inverted index: subject → set of teacher ids
+    - sorted (hourly_rate, id) and (rating, id) lists for range filters
+    - sorted (lowercase name, id) list for name-prefix search
+
+    Documents are added, replaced and removed one at a time, so a changed teacher
+    costs O(log n) lookups plus a list insert instead of a full rebuild.
+    """
+
+    def __init__(self):
+        self._docs = {}
+        self._fields = {}
+        self._by_subject = defaultdict(set)
+        self._rates = []
+        self._ratings = []
+        self._names = []
+        self._lock = threading.RLock()
+        self.synced_at = None
+        # Bumped whenever any stored document changes, so derived data can be rebuilt lazily.
+        self.version = 0
+
+    def __len__(self):
+        return len(self._docs)
+
+    @staticmethod
+    def _sorted_remove(entries, entry):
+        i = bisect_left(entries, entry)
+        if i < len(entries) and entries[i] == entry:
+            del entries[i]
+
+    def _unindex(self, teacher_id):
+        name, rate, rating, subjects = self._fields.pop(teacher_id)
+        for subject in subjects:
+            ids = self._by_subject[subject]
+            ids.discard(teacher_id)
+            if not ids:
+                del self._by_subject[subject]
+        if rate is not None:
+            self._sorted_remove(self._rates, (rate, teacher_id))
+        if rating is not None:
+            self._sorted_remove(self._ratings, (rating, teacher_id))
+        self._sorted_remove(self._names, (name, teacher_id))
+
+    def get(self, teacher_id):
+        return self._docs.get(str(teacher_id))
+
+    def upsert(self, teacher):
+        """
+        Add or replace one teacher document.
+
+        Returns:
+            bool: True if the document was new or its indexed fields changed.
+        """
+        teacher_id = teacher.get("id")
+        if teacher_id is None:
+            return False
+        teacher_id = str(teacher_id)
+        fields = _indexed_fields(teacher)
+        with self._lock:
+            if self._docs.get(teacher_id) != teacher:
+                self.version += 1
+            self._docs[teacher_id] = teacher
+            if self._fields.get(teacher_id) == fields:
+                return False
+            if teacher_id in self._fields:
+                self._unindex(teacher_id)
+            name, rate, rating, subjects = fields
+            self._fields[teacher_id] = fields
+            for subject in subjects:
+                self._by_subject[subject].add(teacher_id)
+            if rate is not None:
+                insort(self._rates, (rate, teacher_id))
+            if rating is not None:
+                insort(self._ratings, (rating, teacher_id))
+            insort(self._names, (name, teacher_id))
+            return True
+
+    def remove(self, teacher_id):
+        teacher_id = str(teacher_id)
+        with self._lock:
+            if teacher_id in self._docs:
+                del self._docs[teacher_id]
+                self._unindex(teacher_id)
+                self.version += 1
+
+    def sync(self, teachers):
+        """
+        Bring the index in line with a full /teachers/ payload.
+
+        Only documents whose indexed fields changed are re-indexed, and ids missing
+        from the payload are removed.
+
+        Returns:
+            int: Number of documents that were added, changed or removed.
+        """
+        with self._lock:
+            changed = 0
+            seen = set()
+            for teacher in teachers:
+                if isinstance(teacher, Mapping) and teacher.get("id") is not None:
+                    seen.add(str(teacher["id"]))
+                    changed += self.upsert(teacher)
+            for teacher_id in set(self._docs) - seen:
+                self.remove(teacher_id)
+                changed += 1
+            self.synced_at = time.monotonic()
+            return changed
+
+    def documents(self):
+        """Return every stored teacher document."""
+        with self._lock:
+            return list(self._docs.values())
+
+    def subjects(self):
+        with self._lock:
+            return sorted(self._by_subject)
+
+    def query(self, subjects=None, max_rate=None, min_rating=None, name_prefix=None):
+        """
+        Return teachers matching every given filter, best rated first.
+
+        Args:
+            subjects (list): Match teachers who teach any of these subjects (case-insensitive).
+            max_rate (float): Upper bound on hourly_rate, inclusive.
+            min_rating (float): Lower bound on rating, inclusive.
+            name_prefix (str): Case-insensitive prefix of the teacher's name.
+
+        Returns:
+            list: Matching teacher documents.
+        """
+        with self._lock:
+            # Each filter can produce its candidate ids directly (an inverted-index set or a
+            # bisected slice). Start from the most selective one and check the remaining
+            # filters against the stored fields, so the cost tracks the smallest match set.
+            sources = []
+            if subjects:
+                ids = set()
+                for subject in subjects:
+                    ids |= self._by_subject.get(subject.strip().lower(), set())
+                sources.append((len(ids), lambda ids=ids: ids))
+            if max_rate is not None:
+                end = bisect_right(self._rates, max_rate, key=lambda entry: entry[0])
+                sources.append((end, lambda: (teacher_id for _, teacher_id in self._rates[:end])))
+            if min_rating is not None:
+                start = bisect_left(self._ratings, min_rating, key=lambda entry: entry[0])
+                sources.append((len(self._ratings) - start,
+                                lambda: (teacher_id for _, teacher_id in self._ratings[start:])))
+            prefix = name_prefix.strip().lower() if name_prefix else ""
+            if prefix:
+                low = bisect_left(self._names, prefix, key=lambda entry: entry[0])
+                high = bisect_left(self._names, prefix + "\uffff", key=lambda entry: entry[0])
+                sources.append((high - low, lambda: (teacher_id for _, teacher_id in self._names[low:high])))
+
+            candidates = min(sources, key=lambda source: source[0])[1]() if sources else self._docs
+            wanted = {subject.strip().lower() for subject in subjects or []}
+
+            def keep(teacher_id):
+                name, rate, rating, teacher_subjects = self._fields[teacher_id]
+                return ((not wanted or not wanted.isdisjoint(teacher_subjects))
+                        and (max_rate is None or (rate is not None and rate <= max_rate))
+                        and (min_rating is None or (rating is not None and rating >= min_rating))
+                        and name.startswith(prefix))
+
+            matches = [teacher_id for teacher_id in candidates if keep(teacher_id)]
+
+            def rank(teacher_id):
+                _, rate, rating, _ = self._fields[teacher_id]
+                return -(rating or 0), rate if rate is not None else float("inf"), teacher_id
+
+            return [self._docs[teacher_id] for teacher_id in sorted(matches, key=rank)]
+
+
+_teacher_index = TeacherIndex()
+
+
+def _index_written(document):
+    try:
+        _teacher_index.upsert(Teacher.from_wire(document))
+    except ValidationError as e:
+        logger.warning("Teacher write not applied to the index: %s", e)
+
+
+def _on_teacher_write(method, endpoint, data):
+    """Keep the index current with teacher documents written by this process."""
+    parts = [part for part in endpoint.split("?", 1)[0].split("/") if part]
+    if not parts or parts[0] != "teachers":
+        return
+    if method == "DELETE" and len(parts) == 2:
+        _teacher_index.remove(parts[1])
+    elif not isinstance(data, dict):
+        return
+    elif method in ("PUT", "PATCH") and len(parts) == 2:
+        previous = _teacher_index.get(parts[1])
+        _index_written({**(previous.to_wire() if previous else {}), **data, "id": parts[1]})
+    elif method == "POST" and len(parts) == 1:
+        _index_written(data)
+
+
+add_write_listener(_on_teacher_write)
+
+
+def get_teacher_index():
+    """
+    Return the shared teacher index, re-syncing it from /teachers/ once it is older
+    than the /teachers cache TTL (writes made through send_data are applied immediately).
+
+    Raises:
+        requests.exceptions.RequestException, ValueError: If /teachers/ can't be read in
+            full (see stream_data); the index is left as it was.
+    """
+    index = _teacher_index
+    if index.synced_at is None or time.monotonic() - index.synced_at > CACHE_TTLS["/teachers"]:
+        # Streamed, so the payload is held as records only; a failed or truncated download
+        # raises before anything is synced, rather than removing the teachers it missed.
+        changed = index.sync(list(stream_data("/teachers/")))
+        logger.info("Teacher index synced: %d teachers, %d changed.", len(index), changed)
+    return index
@@ -0,0 +1,56 @@
+import pytest
+
+from models import Meeting, Student, Teacher, ValidationError, to_records
+
+
+def test_legacy_documents_decode():
+    teacher = Teacher.from_wire({
+        "id": "t1",
+        "hourly_rate": "N/A",
+        "meetings": [{"id": "m1"}, {"id": "m2"}],
+        "available": [{"start": "2025-01-06T10:00:00", "end": "2025-01-06T12:00:00"}],
+    })
+    assert teacher["hourly_rate"] == "N/A"
+    assert teacher["meetings"] == [{"id": "m1"}, {"id": "m2"}]
+    assert teacher["available"][0]["end"].hour == 12
+    assert "name" not in teacher
+
+    meeting = Meeting.from_wire({"id": "m1", "start_time": "10:00:00", "finish_time": "2025-01-06T11:00:00"})
+    assert meeting["start_time"] == "10:00:00"
+    assert meeting["finish_time"].hour == 11
+
+
+def test_legacy_documents_round_trip():
+    legacy = {"id": "m1", "start_time": "10:00:00", "people": [{"id": "s1", "role": "Student"}], "room": 4}
+    assert Meeting.from_wire(legacy).copy() == legacy
+
+
+def test_documents_without_id_are_rejected():
+    with pytest.raises(ValidationError):
+        Student.from_wire({"name": "Dana"})
+    with pytest.raises(ValidationError):
+        Student.from_wire({"id": {"$oid": "s1"}})
+
+
+def test_to_records_keeps_legacy_and_drops_invalid():
+    records = to_records([{"id": "t1", "hourly_rate": "N/A"}, {"name": "no id"}, "junk"], Teacher)
+    assert [record["id"] for record in records] == ["t1"]
+
+
+def test_copy_returns_the_document_as_received():
+    stored = {
+        "id": 7,
+        "name": "Dana",
+        "subjects_to_teach": ["math", None, 3],
+        "available": [{"start": "2025-01-06T10:00:00", "end": "2025-01-06T09:00:00"}, "junk"],
+        "people": None,
+        "legacy_field": {"kept": True},
+    }
+    teacher = Teacher.from_wire(stored)
+    assert teacher["id"] == "7"
+    assert teacher["available"] == ()
+
+    edited = teacher.copy()
+    edited["name"] = "Dana Cohen"
+    assert edited == {**stored, "name": "Dana Cohen"}
+    assert teacher.copy() == stored
@@ -0,0 +1,82 @@
+from collections.abc import Mapping
+from datetime import datetime
+from functools import lru_cache, wraps
+
+from config import env
+
+# Display formats used across the dashboards
+LONG_DATETIME = "%A, %B %d, %Y at %I:%M %p"  # Monday, January 06, 2025 at 02:30 PM
+TIME_12H = "%I:%M %p"                        # 02:30 PM
+LONG_DATE = "%A, %d %B %Y"                   # Monday, 06 January 2025
+TIME_24H = "%H:%M"                           # 14:30
+
+
+def memo_size():
+    """Entries kept by each formatting memo (TIME_FORMAT_MEMO_SIZE)."""
+    return int(env("TIME_FORMAT_MEMO_SIZE", "4096"))
+
+
+def _memoized(func):
+    """
+    lru_cache sized by memo_size(), built on the first call so importing this module
+    doesn't read the configuration.
+    """
+    cached = None
+
+    @wraps(func)
+    def wrapper(*args):
+        nonlocal cached
+        if cached is None:
+            cached = lru_cache(maxsize=memo_size())(func)
+        return cached(*args)
+
+    return wrapper
+
+
+@_memoized
+def parse_iso(raw):
+    """
+    Parse an ISO 8601 timestamp once and memoize it by the raw string.
+
+    Returns:
+        datetime or None: None if `raw` is not a valid ISO string.
+    """
+    try:
+        return datetime.fromisoformat(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+@_memoized
+def format_time(value, fmt):
+    """
+    Format an ISO string or datetime with `fmt`, memoized by (value, fmt).
+
+    Returns:
+        str or None: None if `value` can't be parsed.
+    """
+    dt = value if isinstance(value, datetime) else parse_iso(value)
+    return dt.strftime(fmt) if dt is not None else None
+
+
+def format_interval(interval, start_fmt=LONG_DATETIME, end_fmt=TIME_12H):
+    """
+    Format an availability interval ({"start", "end"} dict or (start, end) tuple).
+
+    Returns:
+        tuple or None: (start_str, end_str), or None if either end is invalid so the
+        caller can fall back to showing the raw values.
+    """
+    if isinstance(interval, Mapping):
+        start, end = interval.get("start"), interval.get("end")
+    elif isinstance(interval, (tuple, list)) and len(interval) == 2:
+        start, end = interval
+    else:
+        return None
+    try:
+        start_str, end_str = format_time(start, start_fmt), format_time(end, end_fmt)
+    except TypeError:  # unhashable junk in the payload
+        return None
+    if start_str is None or end_str is None:
+        return None
+    return start_str, end_str
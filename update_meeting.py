@@ -1,22 +1,187 @@
-def handle_meeting_actions(meeting_id, action):
+import time
+
+import streamlit as st
+
+from server_requests import send_data_in_background, update_meetings_in_background, logger, CACHE_TTLS
+from meeting_stream import apply_meeting_deltas
+
+ACTION_STATUSES = {"Approve": "Approved", "Cancel": "Canceled"}
+
+# How often the page checks whether a background meeting update has finished
+ACTION_POLL_SECONDS = 1.0
+
+
+def _pending_actions():
+    """
+    Meeting id -> in-flight action: {"action", "status", "previous", "future"}, plus
+    "meeting", the document as last listed, once a list has shown it.
+    """
+    return st.session_state.setdefault("pending_meeting_actions", {})
+
+
+def _settled_actions():
+    """
+    Meeting id -> successful action whose status the loaded lists may not carry yet:
+    {"status", "meeting", "until"}, kept until a list shows the status or "until"
+    (time.monotonic()) has passed, by when any cached list has been refetched.
     """
-    Handle meeting actions like Cancel or Approve.
+    return st.session_state.setdefault("settled_meeting_actions", {})
+
+
+def handle_meeting_actions(meeting_id, action, previous_status=None):
+    """
+    Handle meeting actions like Cancel or Approve, optimistically.
+
+    The new status is recorded locally straight away and the PUT is sent from a
+    background thread, so the click costs no round trip. Meant to be used as a button
+    on_click callback: it runs before the section re-renders, and reconcile_meeting_actions()
+    then shows the new status. If the PUT fails the meeting falls back to its previous
+    status and an error is shown.
 
     Args:
         meeting_id (str): The ID of the meeting.
         action (str): The action to perform (e.g., "Approve", "Cancel").
+        previous_status (str): The status shown before the action, for the rollback notice.
 
     Returns:
         None
     """
+    if not meeting_id:
+        return
+    status = ACTION_STATUSES.get(action, "Canceled")
+    pending = _pending_actions()
+    if pending.get(meeting_id, {}).get("status") == status:
+        return  # double click while the first request is still in flight
+    try:
+        future = send_data_in_background(f"/meetings/{meeting_id}", {"status": status}, method="PUT")
+    except Exception:
+        logger.exception("Error performing action '%s' for meeting %s", action, meeting_id)
+        st.toast(f"⚠️ Couldn't {action.lower()} the meeting. Please try again.")
+        return
+    pending[meeting_id] = {"action": action, "status": status, "previous": previous_status, "future": future}
+    logger.info("Meeting %s requested for %s (sent in background)", action, meeting_id)
+
+
+def handle_bulk_meeting_actions(action, previous_statuses):
+    """
+    Apply Approve or Cancel to many meetings at once, optimistically.
+
+    Like handle_meeting_actions, but the whole selection goes to the backend in a single
+    background request (see update_meetings_in_background) and each meeting then settles,
+    or rolls back, on its own. Meetings already in (or on their way to) the target status
+    are skipped.
+
+    Args:
+        action (str): The action to perform (e.g., "Approve", "Cancel").
+        previous_statuses (dict): Meeting id -> status shown before the action, for each
+            selected meeting.
+
+    Returns:
+        int: Number of meetings the action was sent for.
+    """
+    status = ACTION_STATUSES.get(action, "Canceled")
+    pending = _pending_actions()
+    chosen = [meeting_id for meeting_id, previous in previous_statuses.items()
+              if meeting_id and previous != status and pending.get(meeting_id, {}).get("status") != status]
+    if not chosen:
+        return 0
     try:
-        status = "Approved" if action == "Approve" else "Canceled"
-        if send_data(f"/meetings/{meeting_id}", {"status": status}, method="PUT"):
-            logger.info(f"Meeting {action}d: {meeting_id}")
-            st.success(f"Meeting {action}d successfully.")
+        futures = update_meetings_in_background({meeting_id: status for meeting_id in chosen})
+    except Exception:
+        logger.exception("Error performing action '%s' for %d meetings", action, len(chosen))
+        st.toast(f"⚠️ Couldn't {action.lower()} the meetings. Please try again.")
+        return 0
+    for meeting_id, future in futures.items():
+        pending[meeting_id] = {"action": action, "status": status, "previous": previous_statuses[meeting_id],
+                               "future": future}
+    logger.info("Meeting %s requested for %d meetings (sent in background)", action, len(chosen))
+    return len(chosen)
+
+
+def reconcile_meeting_actions(meetings, status_filter=None):
+    """
+    Apply in-flight and just-finished actions to a freshly loaded list of meetings.
+
+    Statuses pushed by the backend since the list was loaded are applied first (see
+    meeting_stream). Meetings with an action in flight show its status (marked
+    "pending_action"); finished actions are settled: a success keeps the new status until
+    a loaded list carries it (for at most the meetings' cache TTL), a failure rolls back
+    to the server's status and shows an error.
+
+    Args:
+        meetings (list): Meeting documents as loaded (not modified).
+        status_filter (str): The status the list is filtered by, if any; meetings whose
+            local status no longer matches it are left out, and meetings listed earlier
+            whose local status now matches it are added.
+
+    Returns:
+        list: The meetings to display.
+    """
+    pending = _pending_actions()
+    settled = _settled_actions()
+    now = time.monotonic()
+    for meeting_id, entry in list(settled.items()):
+        if entry["until"] <= now:
+            del settled[meeting_id]
+    failed = {}
+    for meeting_id, entry in list(pending.items()):
+        if not entry["future"].done():
+            continue
+        del pending[meeting_id]
+        ok, detail = entry["future"].result()
+        if ok:
+            settled[meeting_id] = {"status": entry["status"], "meeting": entry.get("meeting"),
+                                   "until": now + CACHE_TTLS["/meetings"]}
+            logger.info("Meeting %sd: %s", entry["action"], meeting_id)
         else:
-            logger.error(f"Failed to {action} meeting: {meeting_id}")
-            st.error(f"Failed to {action} the meeting.")
-    except Exception as e:
-        logger.exception(f"Error performing action '{action}' for meeting {meeting_id}")
-        st.error(f"An error occurred while trying to {action} the meeting. Please try again.")
+            logger.error("Failed to %s meeting %s: %s", entry["action"], meeting_id, detail)
+            failed.setdefault(entry["action"], []).append((entry, detail))
+    for action, failures in failed.items():
+        entry, detail = failures[0]
+        if len(failures) == 1:
+            back_to = f" It is still {entry['previous']}." if entry["previous"] else ""
+            st.error(f"Failed to {action.lower()} the meeting: {detail}.{back_to}")
+        else:  # one notice for a failed batch, not one per meeting
+            st.error(f"Failed to {action.lower()} {len(failures)} meetings (e.g. {detail}). "
+                     "They keep their previous status.")
+
+    shown = []
+    listed = set()
+    for meeting in apply_meeting_deltas(meetings):
+        meeting_id = meeting.get("id")
+        listed.add(meeting_id)
+        if meeting_id in pending:
+            pending[meeting_id]["meeting"] = meeting
+            meeting = {**meeting, "status": pending[meeting_id]["status"], "pending_action": True}
+        elif meeting_id in settled:
+            settled[meeting_id]["meeting"] = meeting
+            if meeting.get("status") == settled[meeting_id]["status"]:
+                del settled[meeting_id]  # the list has caught up
+            else:
+                meeting = {**meeting, "status": settled[meeting_id]["status"]}
+        if status_filter and meeting.get("status") != status_filter:
+            continue
+        shown.append(meeting)
+    if status_filter:
+        # Meetings that moved into the filtered status locally, which the loaded list can't hold yet
+        for meeting_id, entry in [*pending.items(), *settled.items()]:
+            if meeting_id not in listed and entry["status"] == status_filter and entry.get("meeting") is not None:
+                shown.append({**entry["meeting"], "status": entry["status"],
+                              "pending_action": meeting_id in pending})
+    return shown
+
+
+def watch_meeting_actions():
+    """
+    While actions are in flight, poll for their completion every ACTION_POLL_SECONDS and
+    rerun the app once one finishes, so its outcome shows up unprompted.
+    Renders nothing and stops polling when nothing is pending.
+    """
+    if _pending_actions():
+        _pending_actions_watcher()
+
+
+@st.fragment(run_every=ACTION_POLL_SECONDS)
+def _pending_actions_watcher():
+    if any(entry["future"].done() for entry in _pending_actions().values()):
+        st.rerun()
@@ -1,12 +1,27 @@
-from login_register_logout import *
-from server_requests import *
+from login_register_logout import login, register, logout
+from server_requests import backend_call_count, cache_stats, gather, metrics_snapshot, send_data, write_queue
 from student_view import student_view
 from teacher_view import teacher_view
+from fragments import record_backend_calls
+from repositories import begin_rerun, find_profile, user_repo
+from config import ConfigError, base_url, env
+from request_logging import configure_logging
 import streamlit as st
+from collections.abc import Mapping
 from datetime import datetime
+from functools import partial
+from intervals import IntervalSet
+from time_format import format_interval, LONG_DATETIME, TIME_12H
 
 
 def main():
+    configure_logging()
+    try:
+        base_url()
+    except ConfigError as e:
+        st.error(str(e))
+        st.stop()
+
     # Initialize session state variables
     if "user_id" not in st.session_state:
         st.session_state.update({
@@ -16,16 +31,76 @@ def main():
             "navigation": "auth",  # Controls navigation state
         })
 
-    # Render header
-    render_header()
+    begin_rerun()
+    before = backend_call_count()
+    try:
+        # Render header
+        render_header()
+
+        # Handle navigation dynamically
+        if st.session_state.navigation == "auth":
+            render_authentication_page()
+        elif st.session_state.navigation == "profile_creation":
+            render_profile_creation()
+        elif st.session_state.navigation == "main_app":
+            render_main_app()
+    finally:
+        # Full-script reruns, for comparison with the per-section fragment reruns
+        record_backend_calls("Full page", backend_call_count() - before)
+
+    if st.session_state.user_authenticated and write_queue() is not None:
+        render_write_queue_status()
+
+    if env("DEBUG_PANEL") or st.query_params.get("debug"):
+        render_debug_panel()
+
+
+def render_write_queue_status():
+    """Sidebar notice for this user's changes that are waiting in the write-behind queue."""
+    queue = write_queue()
+    entries = queue.entries(user_id=st.session_state.user_id)
+    if not entries:
+        return
+    pending = [e for e in entries if e["state"] == "pending"]
+    failed = [e for e in entries if e["state"] == "failed"]
+    with st.sidebar.expander(f"⏳ {len(pending)} change(s) waiting to sync, {len(failed)} failed",
+                             expanded=bool(failed)):
+        for entry in entries:
+            when = datetime.fromtimestamp(entry["next_attempt_at"]).strftime("%H:%M:%S")
+            line = f"**{entry['method']}** `{entry['endpoint']}` — attempt {entry['attempts']}"
+            if entry["coalesced"]:
+                line += f", {entry['coalesced']} newer edit(s) merged"
+            if entry["state"] == "pending":
+                line += f", next try at {when}"
+            st.markdown(line)
+            if entry["last_error"]:
+                st.caption(f"Last error: {entry['last_error']}")
+            if entry["state"] == "failed" and st.button("Discard", key=f"discard_write_{entry['id']}"):
+                queue.discard(entry["id"])
+                st.rerun()
+        if st.button("Retry now", key="retry_queued_writes"):
+            queue.retry_now(user_id=st.session_state.user_id)
+            st.rerun()
 
-    # Handle navigation dynamically
-    if st.session_state.navigation == "auth":
-        render_authentication_page()
-    elif st.session_state.navigation == "profile_creation":
-        render_profile_creation()
-    elif st.session_state.navigation == "main_app":
-        render_main_app()
+
+def render_debug_panel():
+    """Sidebar panel with per-endpoint request metrics, cache counters and backend calls per rerun."""
+    with st.sidebar.expander("🔧 Debug: Backend Metrics"):
+        st.markdown("**Requests by endpoint**")
+        rows = metrics_snapshot()
+        if rows:
+            st.dataframe(
+                [{**row, "statuses": ", ".join(f"{k}×{v}" for k, v in row["statuses"].items())} for row in rows],
+                hide_index=True,
+            )
+        else:
+            st.caption("No backend requests yet.")
+        st.markdown("**Response cache**")
+        st.json(cache_stats(), expanded=False)
+        st.markdown("**Identity map (documents loaded vs. reused within a rerun)**")
+        st.json(st.session_state.get("identity_map_stats", {}), expanded=False)
+        st.markdown("**Backend calls per rerun**")
+        st.json(st.session_state.get("fragment_stats", {}), expanded=False)
 
 
 def render_header():
@@ -50,7 +125,7 @@ def toggle_profile():
     new_profile_type = "Teacher" if st.session_state.profile_type == "Student" else "Student"
 
     # Check if the new profile exists
-    if not check_existing_profile(new_profile_type):
+    if not find_profile(new_profile_type):
         create_profile(new_profile_type)
 
     # Switch the profile
@@ -59,34 +134,15 @@ def toggle_profile():
 
 
 def validate_and_convert_intervals(intervals):
-    """Ensure all time intervals are dictionaries with ISO 8601 'start' and 'end' strings."""
-    validated = []
-
-    for item in intervals:
-        if not isinstance(item, dict):
-            continue  # skip if not a dictionary
-
-        start = item.get("start")
-        end = item.get("end")
-
-        if isinstance(start, datetime) and isinstance(end, datetime):
-            validated.append({
-                "start": start.isoformat(),
-                "end": end.isoformat()
-            })
-        elif isinstance(start, str) and isinstance(end, str):
-            try:
-                # Make sure the strings are valid ISO datetime strings
-                datetime.fromisoformat(start)
-                datetime.fromisoformat(end)
-                validated.append({
-                    "start": start,
-                    "end": end
-                })
-            except ValueError:
-                continue  # skip invalid string formats
-        # else: skip silently if data is malformed
-    return validated
+    """
+    Normalize availability to the API format: a list of {"start", "end"} ISO 8601 dicts.
+
+    Accepts an IntervalSet or a raw list (datetimes or ISO strings); malformed entries are
+    skipped and overlapping/adjacent slots are merged.
+    """
+    if isinstance(intervals, IntervalSet):
+        return intervals.to_wire()
+    return IntervalSet.from_wire(intervals).to_wire()
 
 
 def create_profile(profile_type):
@@ -158,10 +214,14 @@ def render_authentication_page():
             st.success(f"Welcome back, {st.session_state.get('user_name','User')}!")
 
         if st.button("Continue"):
-            # Figure out which profile they have (if any):
-            if check_existing_profile("Student"):
+            # Figure out which profile they have (if any); both lookups run in parallel.
+            (student_profile, _), (teacher_profile, _) = gather(
+                partial(find_profile, "Student"),
+                partial(find_profile, "Teacher"),
+            )
+            if student_profile:
                 st.session_state.profile_type = "Student"
-            elif check_existing_profile("Teacher"):
+            elif teacher_profile:
                 st.session_state.profile_type = "Teacher"
             else:
                 st.session_state.navigation = "profile_creation"
@@ -230,8 +290,13 @@ def update_session(user_profile):
     # now we update the fields
     st.session_state.user_authenticated = True
     st.session_state.profile_type = None  # Reset profile type
-    # Store additional information
-    user_data = get_user_data(st.session_state.user_id)
+    # Store additional information. The profile lookups don't depend on the user document,
+    # so they run alongside it and "Continue" is then answered from the response cache.
+    (user_data, _), _, _ = gather(
+        partial(user_repo.get, st.session_state.user_id),
+        partial(find_profile, "Student"),
+        partial(find_profile, "Teacher"),
+    )
     st.session_state.user_name = user_profile.get("name", "User")
     st.session_state.user_email = user_data.get("email", "")
 
@@ -263,7 +328,8 @@ def display_full_profile(profile: dict, role: str):
 
     # Subjects & role-specific fields
     if role == "Teacher":
-        st.write(f"**Hourly Rate:** ${profile.get('hourly_rate', 0):.2f}")
+        rate = profile.get("hourly_rate", 0)
+        st.write(f"**Hourly Rate:** ${rate:.2f}" if isinstance(rate, (int, float)) else f"**Hourly Rate:** {rate}")
         st.write(f"**Rating:** {profile.get('rating', 0)} / 5")
         subs = profile.get("subjects_to_teach", [])
         st.write("**Subjects You Can Teach:**", ", ".join(subs) if subs else "_None listed_")
@@ -276,13 +342,10 @@ def display_full_profile(profile: dict, role: str):
     if avail:
         st.write("**Availability:**")
         for i, iv in enumerate(avail, start=1):
-            try:
-                start = datetime.fromisoformat(iv["start"])
-                end = datetime.fromisoformat(iv["end"])
-                start_fmt = start.strftime("%A, %B %d, %Y at %I:%M %p")
-                end_fmt = end.strftime("%I:%M %p")
-                st.markdown(f"> **{i}.** 📅 {start_fmt} → {end_fmt}")
-            except:
+            formatted = format_interval(iv, LONG_DATETIME, TIME_12H)
+            if formatted:
+                st.markdown(f"> **{i}.** 📅 {formatted[0]} → {formatted[1]}")
+            elif isinstance(iv, Mapping):
                 st.markdown(f"> **{i}.** 📅 {iv.get('start', '?')} → {iv.get('end', '?')}")
     else:
         st.write("**Availability:** _None set_")
@@ -294,7 +357,7 @@ def render_profile_creation():
     profile_type = st.radio("Select Your Role", ["Student", "Teacher"], key="profile_type_selection")
 
     # 1) if they already have this role, show it and offer to add the other
-    existing = check_existing_profile(profile_type)
+    existing = find_profile(profile_type)
     if existing:
         # show it
         display_full_profile(existing, profile_type)
@@ -304,7 +367,7 @@ def render_profile_creation():
         if st.button(f"➕ Add {other} Role"):
             # switch the UI into creation mode for the other role
             st.session_state.profile_type_selection = other
-            st.session_state.available_intervals = []
+            st.session_state.available_intervals = IntervalSet()
             st.rerun()
         return  # stop here
 
@@ -320,24 +383,21 @@ def render_profile_creation():
     start_dt = datetime.combine(start_date, start_time)
     end_dt = datetime.combine(end_date, end_time)
 
-    if "available_intervals" not in st.session_state:
-        st.session_state.available_intervals = []
+    if not isinstance(st.session_state.get("available_intervals"), IntervalSet):
+        st.session_state.available_intervals = IntervalSet.from_wire(st.session_state.get("available_intervals"))
 
     if st.button("➕ Add Time Interval"):
         if end_dt <= start_dt:
             st.error("End time must be after start time.")
         else:
-            st.session_state.available_intervals.append({
-                "start": start_dt.isoformat(),
-                "end": end_dt.isoformat()
-            })
+            st.session_state.available_intervals.add(start_dt, end_dt)
             st.success("Interval added!")
 
     st.markdown("#### 🕒 Current Available Time Intervals:")
-    for i, iv in enumerate(st.session_state.available_intervals, start=1):
-        st.write(f"{i}. {iv['start']} → {iv['end']}")
+    for i, (iv_start, iv_end) in enumerate(st.session_state.available_intervals, start=1):
+        st.write(f"{i}. {iv_start.isoformat()} → {iv_end.isoformat()}")
         if st.button(f"Delete {i}", key=f"delete_{i}"):
-            st.session_state.available_intervals.pop(i - 1)
+            st.session_state.available_intervals.remove_at(i - 1)
             st.rerun()
 
     # common fields
@@ -0,0 +1,231 @@
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+
+from response_cache import normalize_path
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending_writes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    method TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    resource TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    token TEXT NOT NULL DEFAULT '',
+    user_id TEXT,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    coalesced INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    last_error TEXT
+);
+-- At most one queued PUT per resource: a newer PUT replaces the payload of the older one.
+CREATE UNIQUE INDEX IF NOT EXISTS pending_put_per_resource
+    ON pending_writes (resource) WHERE method = 'PUT' AND state = 'pending';
+CREATE INDEX IF NOT EXISTS pending_due ON pending_writes (state, next_attempt_at);
+"""
+
+
+class WriteBehindQueue:
+    """
+    Durable queue of writes that couldn't be delivered yet, replayed in the background.
+
+    Rows live in a SQLite file, so they survive a restart of the Streamlit server. A
+    worker thread sends due rows in insertion order through `sender` and backs off
+    exponentially (with jitter) while the backend keeps failing. A PUT to a resource that
+    already has one queued replaces its payload instead of adding a row, so ten availability
+    saves during an outage become one request when it's over.
+
+    Args:
+        path (str): SQLite file.
+        sender (callable): sender(method, endpoint, data, token) -> (outcome, detail) where
+            outcome is "ok", "retry" (transient failure) or "failed" (rejected; kept for
+            the user to see and discard, not retried).
+        base_backoff (float): Delay before the first retry, in seconds; doubles per attempt.
+        max_backoff (float): Upper bound for the delay between attempts.
+        max_attempts (int): Give up (state "failed") after this many attempts.
+        clock (callable): Time source (epoch seconds).
+    """
+
+    def __init__(self, path, sender, base_backoff=2.0, max_backoff=300.0, max_attempts=20, clock=time.time):
+        self.path = path
+        self.sender = sender
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._stopping = False
+        created = not os.path.exists(path)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if created:
+            os.chmod(path, 0o600)  # rows carry the auth token needed to replay them
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def start(self):
+        """Start the background worker (idempotent)."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="write-behind")
+                self._thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def enqueue(self, method, endpoint, data, token="", user_id=None):
+        """
+        Persist a write for later delivery.
+
+        Returns:
+            int: Id of the queued row (the existing row's id when a PUT was coalesced).
+        """
+        now = self._clock()
+        method = method.upper()
+        row = (method, endpoint, normalize_path(endpoint), json.dumps(data), token or "", user_id, now, now, now)
+        with self._lock:
+            if method == "PUT":
+                cursor = self._db.execute(
+                    """INSERT INTO pending_writes
+                           (method, endpoint, resource, payload, token, user_id, next_attempt_at, created_at, updated_at)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT (resource) WHERE method = 'PUT' AND state = 'pending' DO UPDATE SET
+                           endpoint = excluded.endpoint, payload = excluded.payload, token = excluded.token,
+                           user_id = excluded.user_id, updated_at = excluded.updated_at,
+                           coalesced = coalesced + 1
+                       RETURNING id""", row)
+            else:
+                cursor = self._db.execute(
+                    """INSERT INTO pending_writes
+                           (method, endpoint, resource, payload, token, user_id, next_attempt_at, created_at, updated_at)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) RETURNING id""", row)
+            row_id = cursor.fetchone()[0]
+        logger.info("Queued %s %s for background delivery (row %s).", method, normalize_path(endpoint), row_id)
+        self._wake.set()
+        return row_id
+
+    def has_pending(self, endpoint):
+        """True if a write to this resource is still waiting, so a newer one must queue behind it."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM pending_writes WHERE resource = ? AND state = 'pending' LIMIT 1",
+                (normalize_path(endpoint),)).fetchone() is not None
+
+    def entries(self, user_id=None):
+        """Queued and failed rows (oldest first), optionally only those made by `user_id`."""
+        query = ("SELECT id, method, endpoint, state, attempts, coalesced, next_attempt_at, created_at, last_error "
+                 "FROM pending_writes")
+        params = ()
+        if user_id is not None:
+            query += " WHERE user_id = ?"
+            params = (user_id,)
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY id", params).fetchall()
+        keys = ("id", "method", "endpoint", "state", "attempts", "coalesced", "next_attempt_at", "created_at",
+                "last_error")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._db.execute("SELECT state, COUNT(*) FROM pending_writes GROUP BY state").fetchall())
+            coalesced = self._db.execute("SELECT COALESCE(SUM(coalesced), 0) FROM pending_writes").fetchone()[0]
+        return {"pending": counts.get("pending", 0), "failed": counts.get("failed", 0),
+                "coalesced_into_queued": coalesced}
+
+    def discard(self, row_id):
+        with self._lock:
+            self._db.execute("DELETE FROM pending_writes WHERE id = ?", (row_id,))
+
+    def retry_now(self, user_id=None):
+        """Make every pending (and failed) row of `user_id` (or everyone) due immediately."""
+        now = self._clock()
+        query = "UPDATE pending_writes SET state = 'pending', next_attempt_at = ?, attempts = 0"
+        params = [now]
+        if user_id is not None:
+            query += " WHERE user_id = ?"
+            params.append(user_id)
+        with self._lock:
+            # A failed PUT superseded by a newer PUT to the same resource is obsolete; reviving
+            # both would also break the one-pending-PUT-per-resource rule.
+            self._db.execute("DELETE FROM pending_writes WHERE state = 'failed' AND method = 'PUT' AND id NOT IN "
+                             "(SELECT MAX(id) FROM pending_writes WHERE method = 'PUT' GROUP BY resource)")
+            self._db.execute(query, params)
+        self._wake.set()
+
+    def _backoff(self, attempts):
+        delay = min(self.max_backoff, self.base_backoff * 2 ** (attempts - 1))
+        return delay * random.uniform(0.8, 1.2)
+
+    def _next_due(self):
+        """The oldest row that is due now, else the one that becomes due first."""
+        columns = "SELECT id, method, endpoint, payload, token, attempts, next_attempt_at FROM pending_writes "
+        with self._lock:
+            row = self._db.execute(columns + "WHERE state = 'pending' AND next_attempt_at <= ? ORDER BY id LIMIT 1",
+                                   (self._clock(),)).fetchone()
+            if row is None:
+                row = self._db.execute(columns + "WHERE state = 'pending' ORDER BY next_attempt_at LIMIT 1").fetchone()
+            return row
+
+    def _run(self):
+        while not self._stopping:
+            # Clear before looking, so an enqueue that happens after the query still wakes us.
+            self._wake.clear()
+            row = self._next_due()
+            if row is None:
+                self._wake.wait()
+                continue
+            row_id, method, endpoint, payload, token, attempts, due_at = row
+            wait = due_at - self._clock()
+            if wait > 0:
+                self._wake.wait(wait)
+                continue
+            self.deliver(row_id, method, endpoint, payload, token, attempts)
+
+    def deliver(self, row_id, method, endpoint, payload, token, attempts):
+        """Send one row and record the outcome (called by the worker)."""
+        try:
+            outcome, detail = self.sender(method, endpoint, json.loads(payload), token)
+        except Exception as e:  # a bug in the sender must not kill the worker
+            logger.exception("Write-behind delivery of row %s crashed", row_id)
+            outcome, detail = "retry", str(e)
+        attempts += 1
+        now = self._clock()
+        with self._lock:
+            # The row may have been coalesced with a newer payload while we were sending it;
+            # only settle it if the payload we sent is still the current one.
+            current = self._db.execute("SELECT payload FROM pending_writes WHERE id = ?", (row_id,)).fetchone()
+            if current is None:
+                return
+            if outcome == "ok":
+                if current[0] == payload:
+                    self._db.execute("DELETE FROM pending_writes WHERE id = ?", (row_id,))
+                else:
+                    self._db.execute("UPDATE pending_writes SET next_attempt_at = ? WHERE id = ?", (now, row_id))
+            elif outcome == "retry" and attempts < self.max_attempts:
+                self._db.execute(
+                    "UPDATE pending_writes SET attempts = ?, next_attempt_at = ?, last_error = ?, updated_at = ? "
+                    "WHERE id = ?", (attempts, now + self._backoff(attempts), detail, now, row_id))
+            else:
+                self._db.execute(
+                    "UPDATE pending_writes SET state = 'failed', attempts = ?, last_error = ?, updated_at = ? "
+                    "WHERE id = ?", (attempts, detail, now, row_id))
+        if outcome == "ok":
+            logger.info("Delivered queued %s %s (row %s) after %d attempt(s).", method, normalize_path(endpoint),
+                        row_id, attempts)
+        else:
+            logger.warning("Queued %s %s (row %s) attempt %d: %s - %s", method, normalize_path(endpoint), row_id,
+                           attempts, outcome, detail)